@@ -24,9 +24,11 @@ import random
 import pygame
 from pygame import DOUBLEBUF, HWSURFACE, FULLSCREEN
 
+from qpong.log import configure_logging, get_logger
 from qpong.utils.ball import Ball
 from qpong.utils.input import Input
 from qpong.utils.level import Level
+from qpong.utils.presenter import FramePresenter
 from qpong.utils.scene import Scene
 from qpong.utils.parameters import (
     WINDOW_SIZE,
@@ -36,7 +38,8 @@ from qpong.utils.parameters import (
     WIDTH_UNIT,
     MEASURE_RIGHT,
 )
-from qpong.utils.colors import BLACK
+
+_LOGGER = get_logger("game")
 
 
 def main():
@@ -44,16 +47,18 @@ def main():
     Main game loop
     """
 
+    configure_logging()
+
     if not pygame.get_init():
-        print("Warning, fonts disabled")
+        _LOGGER.warning("Fonts disabled")
         pygame.init()
 
     if not pygame.font.get_init():
-        print("Warning, fonts disabled")
+        _LOGGER.warning("Fonts disabled")
         pygame.font.init()
 
     if not pygame.mixer.get_init():
-        print("Warning, sound disabled")
+        _LOGGER.warning("Sound disabled")
         pygame.mixer.init()
 
     # hardware acceleration to reduce flickering. Works only in full screen
@@ -88,8 +93,8 @@ def main():
     moving_sprites.add(level.left_paddle)
     moving_sprites.add(level.right_paddle)
 
-    # update the screen
-    pygame.display.flip()
+    # present only the areas of the screen that changed each frame
+    presenter = FramePresenter(screen)
 
     # reset the ball
     ball.reset()
@@ -101,19 +106,23 @@ def main():
     while input.running:
         # set maximum frame rate
         clock.tick(60)
-        # refill whole screen with black color at each frame
-        screen.fill(BLACK)
+        # redraw the static background of the playing field at each frame
+        if scene.draw_playfield(screen, ball, level.circuit_grid):
+            presenter.invalidate()
 
         ball.update()  # update ball position
-        scene.dashed_line(screen, ball)  # draw dashed line in the middle of the screen
-        scene.score(screen, ball)  # print score
+        presenter.track_value(
+            "score",
+            (ball.check_score(0), ball.check_score(1)),
+            scene.score(screen, ball),
+        )  # print score
 
         # level.statevector_grid.display_statevector(scene.qubit_num) # generate statevector grid
-        level.right_statevector.draw(
-            screen
+        presenter.draw(
+            level.right_statevector, screen
         )  # draw right paddle together with statevector grid
-        level.circuit_grid.draw(screen)  # draw circuit grid
-        moving_sprites.draw(screen)  # draw moving sprites
+        presenter.draw(level.circuit_grid, screen)  # draw circuit grid
+        presenter.draw(moving_sprites, screen)  # draw moving sprites
 
         # Show game over screen if the score reaches WIN_SCORE, reset everything if replay == TRUE
         if ball.score.get_score(CLASSICAL_COMPUTER) >= WIN_SCORE:
@@ -121,14 +130,20 @@ def main():
             scene.replay(
                 screen, ball.score, level.circuit_grid_model, level.circuit_grid
             )
+            # the new game starts without the edits of the last one
+            level.edit_history.clear()
             input.update_paddle(level, screen, scene)
+            presenter.invalidate()
 
         if ball.score.get_score(QUANTUM_COMPUTER) >= WIN_SCORE:
             scene.gameover(screen, QUANTUM_COMPUTER)
             scene.replay(
                 screen, ball.score, level.circuit_grid_model, level.circuit_grid
             )
+            # the new game starts without the edits of the last one
+            level.edit_history.clear()
             input.update_paddle(level, screen, scene)
+            presenter.invalidate()
 
         # computer paddle movement
         if pygame.time.get_ticks() - old_clock > 300:
@@ -142,14 +157,18 @@ def main():
         # handle input events
         input.handle_input(level, screen, scene)
 
+        # show simulation results finished since the last frame
+        level.show_simulation_result()
+
+        # prepare the measurement while the ball approaches the right
+        # measurement zone
+        level.prepare_measurement(ball)
+
         # check ball location and decide what to do
         ball.action()
 
         if ball.ball_action == MEASURE_RIGHT:
-            circuit = level.circuit_grid_model.construct_circuit()
-            pos = level.statevector_grid.paddle_after_measurement(
-                circuit, scene.qubit_num
-            )
+            pos = level.measure_right_paddle(scene)
             level.right_statevector.arrange()
 
             # paddle after measurement
@@ -168,9 +187,13 @@ def main():
             # add a buffer time before measure again
             measure_time = pygame.time.get_ticks() + 100000
 
-        # Update the screen
-        pygame.display.flip()
+        # Update the changed areas of the screen
+        presenter.present()
 
+    _LOGGER.info(
+        "Presented %.0f pixels per frame", presenter.stats()["pixels_per_frame"]
+    )
+    level.simulation_worker.stop()
     pygame.quit()
 
 
@@ -23,12 +23,15 @@ import numpy as np
 
 import pygame
 
+from qpong.log import get_logger
 from qpong.model import circuit_node_types as node_types
 from qpong.model.circuit_grid_model import CircuitGridNode
 from qpong.utils.colors import BLACK, WHITE, MAGENTA
 from qpong.utils.navigation import MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT
-from qpong.utils.resources import load_image
+from qpong.utils.resources import load_cached_image, preload_images
 from qpong.utils.parameters import (
+    WINDOW_WIDTH,
+    WINDOW_HEIGHT,
     WIDTH_UNIT,
     LINE_WIDTH,
     GRID_HEIGHT,
@@ -37,58 +40,172 @@ from qpong.utils.parameters import (
     GATE_TILE_HEIGHT,
 )
 
+_LOGGER = get_logger("controls")
+
+GATE_IMAGES = [
+    "gate_images/" + name + ".png"
+    for name in (
+        "h_gate",
+        "x_gate",
+        "y_gate",
+        "z_gate",
+        "rx_gate",
+        "ry_gate",
+        "rz_gate",
+        "s_gate",
+        "sdg_gate",
+        "t_gate",
+        "tdg_gate",
+        "not_gate_below_ctrl",
+        "not_gate_above_ctrl",
+        "ctrl_gate_bottom_wire",
+        "ctrl_gate_top_wire",
+        "trace_gate",
+        "swap_gate",
+    )
+]
+CURSOR_IMAGE = "cursor_images/circuit-grid-cursor-medium.png"
+
+# columns of gates that fit across the window, leaving a margin on each side
+MAX_VISIBLE_COLUMNS = int(WINDOW_WIDTH // GRID_WIDTH) - 2
+
 # pylint: disable=too-few-public-methods
 class CircuitGrid(pygame.sprite.RenderPlain):
-    """Enables interaction with circuit"""
+    """
+    Enables interaction with circuit. Only a window of the circuit grid
+    model is shown, which scrolls to follow the cursor, so grids of any
+    size have one gate tile per visible node.
+    """
 
-    def __init__(self, xpos, ypos, circuit_grid_model):
+    def __init__(
+        self, xpos, ypos, circuit_grid_model, visible_wires=None, visible_columns=None
+    ):
         self.xpos = xpos
         self.ypos = ypos
         self.circuit_grid_model = circuit_grid_model
         self.selected_wire = 0
         self.selected_column = 0
-        self.circuit_grid_background = CircuitGridBackground(circuit_grid_model)
+        # decode and scale every image once, tiles then share them
+        preload_images(GATE_IMAGES + [CURSOR_IMAGE], -1)
+        if visible_wires is None:
+            # wires whose gate tiles fit between ypos and the window bottom
+            visible_wires = int(
+                (WINDOW_HEIGHT - ypos - GATE_TILE_HEIGHT / 2) // GRID_HEIGHT
+            )
+        if visible_columns is None:
+            visible_columns = MAX_VISIBLE_COLUMNS
+        self.visible_wires = max(1, min(visible_wires, circuit_grid_model.max_wires))
+        self.visible_columns = min(visible_columns, circuit_grid_model.max_columns)
+        # model node shown in the top left corner of the window
+        self.first_wire = 0
+        self.first_column = 0
+        self.circuit_grid_background = CircuitGridBackground(
+            self.visible_wires, self.visible_columns
+        )
         self.circuit_grid_cursor = CircuitGridCursor()
         self.gate_tiles = np.empty(
-            (circuit_grid_model.max_wires, circuit_grid_model.max_columns),
+            (self.visible_wires, self.visible_columns),
             dtype=CircuitGridGate,
         )
 
-        for row_idx in range(self.circuit_grid_model.max_wires):
-            for col_idx in range(self.circuit_grid_model.max_columns):
+        for row_idx in range(self.visible_wires):
+            for col_idx in range(self.visible_columns):
                 self.gate_tiles[row_idx][col_idx] = CircuitGridGate(
                     circuit_grid_model, row_idx, col_idx
                 )
+                self.position_tile(row_idx, col_idx)
 
+        # tiles whose model cells changed since the last update
+        self.changed_tiles = set()
+        circuit_grid_model.add_listener(self.handle_model_change)
+
+        # the background is static and drawn separately with draw_background
         pygame.sprite.RenderPlain.__init__(
             self,
-            self.circuit_grid_background,
             self.gate_tiles,
             self.circuit_grid_cursor,
         )
         self.update()
 
+    def handle_model_change(self, change):
+        """
+        Remember the tiles to refresh on the next update
+
+        Parameters:
+        change (CircuitGridChange): edit of the circuit grid model
+        """
+        self.changed_tiles.update(change.cells)
+
+    def draw_background(self, surface):
+        """
+        Draw the background with the wires of the circuit grid
+
+        Parameters:
+        surface (Surface): surface to draw on
+        """
+        background = self.circuit_grid_background
+        background.rect.topleft = (self.xpos, self.ypos)
+        surface.blit(background.image, background.rect)
+
+    def position_tile(self, row_idx, col_idx):
+        """
+        Center a gate tile on its place in the window
+
+        Parameters:
+        row_idx (integer): row of the tile in the window
+        col_idx (integer): column of the tile in the window
+        """
+        tile = self.gate_tiles[row_idx][col_idx]
+        tile.rect.centerx = self.xpos + GRID_WIDTH * (col_idx + 1.5)
+        tile.rect.centery = self.ypos + GRID_HEIGHT * (row_idx + 1.0)
+
+    def scroll_to(self, wire_num, column_num):
+        """
+        Scroll the window the least needed to show a node, and redraw
+        the gate tiles for the nodes of the new window
+
+        Parameters:
+        wire_num (integer): wire number of the node
+        column_num (integer): column number of the node
+        """
+        first_wire = min(
+            max(self.first_wire, wire_num - self.visible_wires + 1), wire_num
+        )
+        first_column = min(
+            max(self.first_column, column_num - self.visible_columns + 1),
+            column_num,
+        )
+        if (first_wire, first_column) == (self.first_wire, self.first_column):
+            return
+        self.first_wire = first_wire
+        self.first_column = first_column
+        for row_idx in range(self.visible_wires):
+            for col_idx in range(self.visible_columns):
+                tile = self.gate_tiles[row_idx][col_idx]
+                tile.wire_num = first_wire + row_idx
+                tile.column_num = first_column + col_idx
+                tile.update()
+                self.position_tile(row_idx, col_idx)
+
     def update(self):
         """
-        Update tiles on the circuit grid, and selected_node
-        since the last update.
+        Update the tiles of the visible nodes that changed in the circuit
+        grid model, and selected_node since the last update.
         """
-        sprite_list = self.sprites()
-        for sprite in sprite_list:
-            sprite.update()
+        for wire_num, column_num in self.changed_tiles:
+            row_idx = wire_num - self.first_wire
+            col_idx = column_num - self.first_column
+            if (
+                0 <= row_idx < self.visible_wires
+                and 0 <= col_idx < self.visible_columns
+            ):
+                self.gate_tiles[row_idx][col_idx].update()
+                self.position_tile(row_idx, col_idx)
+        self.changed_tiles.clear()
 
         self.circuit_grid_background.rect.left = self.xpos
         self.circuit_grid_background.rect.top = self.ypos
 
-        for row_idx in range(self.circuit_grid_model.max_wires):
-            for col_idx in range(self.circuit_grid_model.max_columns):
-                self.gate_tiles[row_idx][
-                    col_idx
-                ].rect.centerx = self.xpos + GRID_WIDTH * (col_idx + 1.5)
-                self.gate_tiles[row_idx][
-                    col_idx
-                ].rect.centery = self.ypos + GRID_HEIGHT * (row_idx + 1.0)
-
         self.highlight_selected_node(self.selected_wire, self.selected_column)
 
     def highlight_selected_node(self, wire_num, column_num):
@@ -102,14 +219,15 @@ class CircuitGrid(pygame.sprite.RenderPlain):
         """
         self.selected_wire = wire_num
         self.selected_column = column_num
+        self.scroll_to(wire_num, column_num)
         self.circuit_grid_cursor.rect.left = (
             self.xpos
-            + GRID_WIDTH * (self.selected_column + 1)
+            + GRID_WIDTH * (self.selected_column - self.first_column + 1)
             + round(0.375 * WIDTH_UNIT)
         )
         self.circuit_grid_cursor.rect.top = (
             self.ypos
-            + GRID_HEIGHT * (self.selected_wire + 0.5)
+            + GRID_HEIGHT * (self.selected_wire - self.first_wire + 0.5)
             + round(0.375 * WIDTH_UNIT)
         )
 
@@ -298,7 +416,7 @@ class CircuitGrid(pygame.sprite.RenderPlain):
                                 )
                                 == -1
                             ):
-                                print("Can't place control qubit")
+                                _LOGGER.debug("Can't place control qubit")
 
     def handle_input_move_ctrl(self, direction):
         # pylint: disable=too-many-branches disable=too-many-statements disable=too-many-nested-blocks
@@ -331,9 +449,8 @@ class CircuitGrid(pygame.sprite.RenderPlain):
                         self.place_ctrl_qubit(self.selected_wire, candidate_wire_num)
                         == candidate_wire_num
                     ):
-                        print(
-                            "control qubit successfully placed on wire ",
-                            candidate_wire_num,
+                        _LOGGER.debug(
+                            "Control qubit placed on wire %d", candidate_wire_num
                         )
                         if (
                             direction == MOVE_UP
@@ -367,8 +484,8 @@ class CircuitGrid(pygame.sprite.RenderPlain):
                                 )
                         self.update()
                     else:
-                        print(
-                            "control qubit could not be placed on wire ",
+                        _LOGGER.debug(
+                            "Control qubit could not be placed on wire %d",
                             candidate_wire_num,
                         )
 
@@ -406,7 +523,7 @@ class CircuitGrid(pygame.sprite.RenderPlain):
         Returns:
             integer: wire number of control qubit, otherwise -1.
         """
-        if self.circuit_grid_model.max_wires <= candidate_ctrl_wire_num < 0:
+        if not 0 <= candidate_ctrl_wire_num < self.circuit_grid_model.max_wires:
             return -1
         candidate_wire_gate_part = self.circuit_grid_model.get_node_gate_part(
             candidate_ctrl_wire_num, self.selected_column
@@ -426,7 +543,7 @@ class CircuitGrid(pygame.sprite.RenderPlain):
             )
             self.update()
             return candidate_ctrl_wire_num
-        print("Can't place control qubit on wire: ", candidate_ctrl_wire_num)
+        _LOGGER.debug("Can't place control qubit on wire %d", candidate_ctrl_wire_num)
         return -1
 
     def delete_controls_for_gate(self, gate_wire_num, column_num):
@@ -463,7 +580,7 @@ class CircuitGrid(pygame.sprite.RenderPlain):
                 min(gate_wire_num, control_wire_num),
                 max(gate_wire_num, control_wire_num) + 1,
             ):
-                print("Replacing wire ", wire_idx, " in column ", column_num)
+                _LOGGER.debug("Replacing wire %d in column %d", wire_idx, column_num)
                 circuit_grid_node = CircuitGridNode(node_types.EMPTY)
                 self.circuit_grid_model.set_node(
                     wire_idx, column_num, circuit_grid_node
@@ -475,16 +592,18 @@ class CircuitGridBackground(pygame.sprite.Sprite):
     Background for circuit grid
     """
 
-    def __init__(self, circuit_grid_model):
+    def __init__(self, num_wires, num_columns):
         pygame.sprite.Sprite.__init__(self)
 
-        self.image = pygame.Surface([GRID_WIDTH * (18 + 2), GRID_HEIGHT * (3 + 1)])
+        self.image = pygame.Surface(
+            [GRID_WIDTH * (num_columns + 2), GRID_HEIGHT * (num_wires + 1)]
+        )
         self.image.convert()
         self.image.fill(WHITE)
         self.rect = self.image.get_rect()
         pygame.draw.rect(self.image, BLACK, self.rect, LINE_WIDTH)
 
-        for wire_num in range(circuit_grid_model.max_wires):
+        for wire_num in range(num_wires):
             pygame.draw.line(
                 self.image,
                 BLACK,
@@ -516,21 +635,22 @@ class CircuitGridGate(pygame.sprite.Sprite):
         node = self.circuit_grid_model.get_node(self.wire_num, self.column_num)
 
         if node.node_type == node_types.H:
-            self.image, self.rect = load_image("gate_images/h_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/h_gate.png", -1)
         elif node.node_type == node_types.X:
             if node.ctrl_a >= 0 or node.ctrl_b >= 0:
                 # This is a control-X gate or Toffoli gate
                 if self.wire_num > max(node.ctrl_a, node.ctrl_b):
-                    self.image, self.rect = load_image(
+                    self.image, self.rect = load_cached_image(
                         "gate_images/not_gate_below_ctrl.png", -1
                     )
                 else:
-                    self.image, self.rect = load_image(
+                    self.image, self.rect = load_cached_image(
                         "gate_images/not_gate_above_ctrl.png", -1
                     )
             elif node.radians != 0:
-                self.image, self.rect = load_image("gate_images/rx_gate.png", -1)
-                self.rect = self.image.get_rect()
+                self.image, self.rect = load_cached_image("gate_images/rx_gate.png", -1)
+                # the arc is drawn on a copy, the cached image is shared
+                self.image = self.image.copy()
                 pygame.draw.arc(
                     self.image, MAGENTA, self.rect, 0, node.radians % (2 * np.pi), 6
                 )
@@ -543,11 +663,12 @@ class CircuitGridGate(pygame.sprite.Sprite):
                     1,
                 )
             else:
-                self.image, self.rect = load_image("gate_images/x_gate.png", -1)
+                self.image, self.rect = load_cached_image("gate_images/x_gate.png", -1)
         elif node.node_type == node_types.Y:
             if node.radians != 0:
-                self.image, self.rect = load_image("gate_images/ry_gate.png", -1)
-                self.rect = self.image.get_rect()
+                self.image, self.rect = load_cached_image("gate_images/ry_gate.png", -1)
+                # the arc is drawn on a copy, the cached image is shared
+                self.image = self.image.copy()
                 pygame.draw.arc(
                     self.image, MAGENTA, self.rect, 0, node.radians % (2 * np.pi), 6
                 )
@@ -560,11 +681,12 @@ class CircuitGridGate(pygame.sprite.Sprite):
                     1,
                 )
             else:
-                self.image, self.rect = load_image("gate_images/y_gate.png", -1)
+                self.image, self.rect = load_cached_image("gate_images/y_gate.png", -1)
         elif node.node_type == node_types.Z:
             if node.radians != 0:
-                self.image, self.rect = load_image("gate_images/rz_gate.png", -1)
-                self.rect = self.image.get_rect()
+                self.image, self.rect = load_cached_image("gate_images/rz_gate.png", -1)
+                # the arc is drawn on a copy, the cached image is shared
+                self.image = self.image.copy()
                 pygame.draw.arc(
                     self.image, MAGENTA, self.rect, 0, node.radians % (2 * np.pi), 6
                 )
@@ -577,44 +699,40 @@ class CircuitGridGate(pygame.sprite.Sprite):
                     1,
                 )
             else:
-                self.image, self.rect = load_image("gate_images/z_gate.png", -1)
+                self.image, self.rect = load_cached_image("gate_images/z_gate.png", -1)
         elif node.node_type == node_types.S:
-            self.image, self.rect = load_image("gate_images/s_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/s_gate.png", -1)
         elif node.node_type == node_types.SDG:
-            self.image, self.rect = load_image("gate_images/sdg_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/sdg_gate.png", -1)
         elif node.node_type == node_types.T:
-            self.image, self.rect = load_image("gate_images/t_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/t_gate.png", -1)
         elif node.node_type == node_types.TDG:
-            self.image, self.rect = load_image("gate_images/tdg_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/tdg_gate.png", -1)
         elif node.node_type == node_types.CTRL:
             if self.wire_num > self.circuit_grid_model.get_gate_wire_for_control_node(
                 self.wire_num, self.column_num
             ):
-                self.image, self.rect = load_image(
+                self.image, self.rect = load_cached_image(
                     "gate_images/ctrl_gate_bottom_wire.png", -1
                 )
             else:
-                self.image, self.rect = load_image(
+                self.image, self.rect = load_cached_image(
                     "gate_images/ctrl_gate_top_wire.png", -1
                 )
         elif node.node_type == node_types.TRACE:
-            self.image, self.rect = load_image("gate_images/trace_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/trace_gate.png", -1)
         elif node.node_type == node_types.SWAP:
-            self.image, self.rect = load_image("gate_images/swap_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/swap_gate.png", -1)
         else:
             self.image = pygame.Surface([GATE_TILE_WIDTH, GATE_TILE_HEIGHT])
             self.image.set_alpha(0)
             self.rect = self.image.get_rect()
 
-        self.image.convert()
-
 
 class CircuitGridCursor(pygame.sprite.Sprite):
     """Cursor to highlight current grid node"""
 
     def __init__(self):
         pygame.sprite.Sprite.__init__(self)
-        self.image, self.rect = load_image(
-            "cursor_images/circuit-grid-cursor-medium.png", -1
-        )
+        self.image, self.rect = load_cached_image(CURSOR_IMAGE, -1)
         self.image.convert_alpha()
@@ -0,0 +1,124 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Logging for the game, built on the standard logging module.
+
+Each subsystem logs to its own logger below "qpong" so it can be
+switched on separately, e.g. with the environment variable
+
+    QPONG_LOG=warning,controls=debug
+
+Nothing is printed until configure_logging is called. Messages are
+formatted lazily, and call sites whose arguments are costly to compute
+guard them with isEnabledFor, so disabled logging costs a cached level
+check per call.
+"""
+
+import logging
+import os
+import sys
+
+ROOT_LOGGER_NAME = "qpong"
+LOG_ENVIRONMENT_VARIABLE = "QPONG_LOG"
+DEFAULT_LOG_LEVEL = logging.WARNING
+LOG_FORMAT = "%(relativeCreated)8d %(levelname)-7s %(name)s: %(message)s"
+
+SUBSYSTEMS = ("model", "sim", "controls", "viz", "utils", "game")
+
+logging.getLogger(ROOT_LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def get_logger(subsystem):
+    """
+    Get the logger of a subsystem
+
+    Parameters:
+    subsystem (string): one of SUBSYSTEMS
+
+    Returns:
+        Logger: logger named "qpong.<subsystem>"
+    """
+    if subsystem not in SUBSYSTEMS:
+        raise ValueError("Unknown logging subsystem: " + str(subsystem))
+    return logging.getLogger(ROOT_LOGGER_NAME + "." + subsystem)
+
+
+def parse_level(name):
+    """
+    Convert a level name such as "debug" to a logging level
+
+    Parameters:
+    name (string): level name, case insensitive
+
+    Returns:
+        integer: logging level
+    """
+    level = logging.getLevelName(name.strip().upper())
+    if not isinstance(level, int):
+        raise ValueError("Unknown logging level: " + name)
+    return level
+
+
+def set_level(level, subsystem=None):
+    """
+    Set the logging level of all subsystems or of one subsystem
+
+    Parameters:
+    level (integer or string): logging level or level name
+    subsystem (string): one of SUBSYSTEMS, or None for all of them
+    """
+    if isinstance(level, str):
+        level = parse_level(level)
+    if subsystem is None:
+        logging.getLogger(ROOT_LOGGER_NAME).setLevel(level)
+    else:
+        get_logger(subsystem).setLevel(level)
+
+
+def configure_logging(spec=None, stream=None):
+    """
+    Print log messages and set levels from a specification such as
+    "info,model=debug,viz=error". A bare level applies to all
+    subsystems, "subsystem=level" to one of them.
+
+    Parameters:
+    spec (string): level specification, defaults to the QPONG_LOG
+        environment variable
+    stream (file): where messages are written, defaults to stderr
+    """
+    if spec is None:
+        spec = os.environ.get(LOG_ENVIRONMENT_VARIABLE, "")
+
+    root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in root_logger.handlers[:]:
+        if isinstance(handler, logging.StreamHandler):
+            root_logger.removeHandler(handler)
+    handler = logging.StreamHandler(sys.stderr if stream is None else stream)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root_logger.addHandler(handler)
+
+    set_level(DEFAULT_LOG_LEVEL)
+    for subsystem in SUBSYSTEMS:
+        get_logger(subsystem).setLevel(logging.NOTSET)
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        if "=" in item:
+            subsystem, level = item.split("=", 1)
+            set_level(level, subsystem.strip())
+        else:
+            set_level(item)
@@ -18,5 +18,7 @@
 Circuit grid model and node types on the grid
 """
 
-from .circuit_grid_model import CircuitGridModel, CircuitGridNode
+from .circuit_grid_model import CircuitGridModel, CircuitGridNode, CircuitGridChange
+from .edit_history import EditHistory
 from .circuit_node_types import *
+from .qiskit_loader import load_qiskit
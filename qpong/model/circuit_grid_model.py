@@ -17,40 +17,56 @@
 Grid-based model underlying the circuit grid for the quantum player
 """
 
-import numpy as np
+import logging
 
-from qiskit import QuantumCircuit, QuantumRegister
+import numpy as np
 
+from qpong.log import get_logger
 from qpong.model import circuit_node_types as node_types
+from qpong.model.qiskit_loader import load_qiskit
+from qpong.sim.canonical import canonical_key
+from qpong.sim.optimizer import ROTATION_GATES, optimize_gates
+from qpong.sim.result_cache import DEFAULT_CACHE_SIZE, circuit_fingerprint
+from qpong.sim.simulation import CircuitSimulation
 
-NODE_IDENTIFIERS = {
-    0: "i",
-    1: "x",
-    2: "y",
-    3: "z",
-    4: "s",
-    5: "sdg",
-    6: "t",
-    7: "tdg",
-    8: "h",
-    9: "swap",
-    10: "c",
-}
+_LOGGER = get_logger("model")
 
-# pylint: disable=too-few-public-methods
+# One record per grid cell, holding the fields of a CircuitGridNode
+NODE_DTYPE = np.dtype(
+    [
+        ("node_type", np.int8),
+        ("radians", np.float64),
+        ("ctrl_a", np.int16),
+        ("ctrl_b", np.int16),
+        ("swap", np.int16),
+    ]
+)
+
+EMPTY_NODE = np.array((node_types.EMPTY, 0.0, -1, -1, -1), dtype=NODE_DTYPE)
+
+
+# pylint: disable=too-many-public-methods
 class CircuitGridModel:
     """
     Grid-based model that is built when user interacts with circuit
     """
 
-    def __init__(self, max_wires, max_columns):
+    def __init__(self, max_wires, max_columns, cache_size=DEFAULT_CACHE_SIZE):
         self.max_wires = max_wires
         self.max_columns = max_columns
-        self.nodes = np.full(
-            (max_wires, max_columns),
-            CircuitGridNode(node_types.EMPTY),
-            dtype=CircuitGridNode,
-        )
+        self.nodes = np.full((max_wires, max_columns), EMPTY_NODE, dtype=NODE_DTYPE)
+        # wire of the gate owning the control or swap part on each cell, or -1
+        self.control_owners = np.full((max_wires, max_columns), -1, dtype=np.int16)
+        self.swap_owners = np.full((max_wires, max_columns), -1, dtype=np.int16)
+        self.simulation = CircuitSimulation(max_wires, max_columns, cache_size)
+        # incremented on every edit
+        self.version = 0
+        # callables receiving a CircuitGridChange after every edit
+        self.listeners = []
+        self.fingerprint = None
+        self.gates = None
+        self.simulation_key = None
+        self.circuit = None
 
     def __str__(self):
         retval = ""
@@ -69,13 +85,86 @@ class CircuitGridModel:
         column_num (integer): column number
         circuit_grid_node (CircuitGridNode): node to be assigned
         """
-        self.nodes[wire_num][column_num] = CircuitGridNode(
+        old_node = self.nodes[wire_num, column_num].tolist()
+        self.nodes[wire_num, column_num] = (
             circuit_grid_node.node_type,
             circuit_grid_node.radians,
             circuit_grid_node.ctrl_a,
             circuit_grid_node.ctrl_b,
             circuit_grid_node.swap,
         )
+        new_node = self.nodes[wire_num, column_num].tolist()
+        if new_node == old_node:
+            # nothing changed
+            return
+
+        self.version += 1
+        self.invalidate()
+        referenced_wires = {
+            old_node[2],
+            old_node[3],
+            old_node[4],
+            circuit_grid_node.ctrl_a,
+            circuit_grid_node.ctrl_b,
+            circuit_grid_node.swap,
+        }
+        cells = {(wire_num, column_num)}
+        for referenced_wire in referenced_wires:
+            if 0 <= referenced_wire < self.max_wires:
+                self.index_cell(referenced_wire, column_num)
+                cells.add((int(referenced_wire), column_num))
+        self.notify(cells, [(wire_num, column_num, old_node, new_node)])
+
+    def add_listener(self, listener):
+        """
+        Register a callable to receive a CircuitGridChange after every edit
+
+        Parameters:
+        listener (callable): called with the change
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Unregister a callable added with add_listener
+
+        Parameters:
+        listener (callable): listener to be removed
+        """
+        self.listeners.remove(listener)
+
+    def notify(self, cells, edits):
+        """
+        Send a change to all listeners
+
+        Parameters:
+        cells (set): (wire number, column number) of the changed cells
+        edits (list): (wire number, column number, old fields, new fields)
+        of the nodes written
+        """
+        change = CircuitGridChange(self.version, cells, edits)
+        for listener in list(self.listeners):
+            listener(change)
+
+    def index_cell(self, wire_num, column_num):
+        """
+        Update the gates owning the control and swap parts on a cell
+
+        Parameters:
+        wire_num (integer): wire number
+        column_num (integer): column number
+        """
+        column = self.nodes[:, column_num]
+        gate_wires = np.nonzero(
+            (column["ctrl_a"] == wire_num) | (column["ctrl_b"] == wire_num)
+        )[0]
+        self.control_owners[wire_num, column_num] = (
+            gate_wires[-1] if len(gate_wires) > 0 else -1
+        )
+        gate_wires = np.nonzero(column["swap"] == wire_num)[0]
+        self.swap_owners[wire_num, column_num] = (
+            gate_wires[-1] if len(gate_wires) > 0 else -1
+        )
 
     def get_node(self, wire_num, column_num):
         """
@@ -87,10 +176,12 @@ class CircuitGridModel:
         column_num (integer): column number
 
         Returns:
+            CircuitGridNode: a copy of the node, to be modified and
+            passed back to set_node
         """
 
         if wire_num < self.max_wires and column_num < self.max_columns:
-            return self.nodes[wire_num][column_num]
+            return CircuitGridNode(*self.nodes[wire_num, column_num].tolist())
 
         return None
 
@@ -103,20 +194,19 @@ class CircuitGridModel:
         wire_num (integer): wire number
         column_num (integer): column number
         """
-        requested_node = self.get_node(wire_num, column_num)
-        if requested_node and requested_node.node_type != node_types.EMPTY:
+        if not (0 <= wire_num < self.max_wires and column_num < self.max_columns):
+            return node_types.EMPTY
+
+        node_type = self.nodes["node_type"][wire_num, column_num]
+        if node_type != node_types.EMPTY:
             # Node is occupied so return its gate
-            return requested_node.node_type
+            return int(node_type)
 
         # Check for control nodes from gates in other nodes in this column
-        nodes_in_column = self.nodes[:, column_num]
-        for idx in range(self.max_wires):
-            if idx != wire_num:
-                other_node = nodes_in_column[idx]
-                if wire_num in (other_node.ctrl_a, other_node.ctrl_b):
-                    return node_types.CTRL
-                if other_node.swap == wire_num:
-                    return node_types.SWAP
+        if self.control_owners[wire_num, column_num] != -1:
+            return node_types.CTRL
+        if self.swap_owners[wire_num, column_num] != -1:
+            return node_types.SWAP
 
         return node_types.EMPTY
 
@@ -128,74 +218,261 @@ class CircuitGridModel:
         control_wire_num (integer): wire number of control qubit
         column_num (integer): column number
         """
-        gate_wire_num = -1
-        nodes_in_column = self.nodes[:, column_num]
-        for wire_idx in range(self.max_wires):
-            if wire_idx != control_wire_num:
-                other_node = nodes_in_column[wire_idx]
-                if control_wire_num in (other_node.ctrl_a, other_node.ctrl_b):
-                    gate_wire_num = wire_idx
-                    print(
-                        "Found gate: ",
-                        self.get_node_gate_part(gate_wire_num, column_num),
-                        " on wire: ",
-                        gate_wire_num,
-                    )
+        gate_wire_num = int(self.control_owners[control_wire_num, column_num])
+        if gate_wire_num != -1 and _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Found gate %s on wire %d",
+                self.get_node_gate_part(gate_wire_num, column_num),
+                gate_wire_num,
+            )
         return gate_wire_num
 
     def construct_circuit(self):
         """
         Construct quantum circuit with instruction on circuit grid
         """
-        register = QuantumRegister(self.max_wires, "q")
-        circuit = QuantumCircuit(register)
-
-        for column_num in range(self.max_columns):
-            for wire_num in range(self.max_wires):
-                print(column_num, wire_num)
-                node = self.nodes[wire_num][column_num]
-                attr = []
-                args = []
-
-                if node.radians != 0:
-                    args.append(node.radians)
-
-                if node.ctrl_a != -1:
-                    attr.append("c")
-                    args.append(register[node.ctrl_a])
-
-                if node.ctrl_b != -1:
-                    attr.append("c")
-                    args.append(register[node.ctrl_b])
-
-                if node.swap != -1:
-                    attr.append("swap")
-                    args.append(register[wire_num])
-                    args.append(register[node.swap])
-                else:
-                    if node.radians != 0:
-                        attr.append("r")
-                    if node.node_type != node_types.EMPTY:
-                        args.append(register[wire_num])
-                        if node.node_type in NODE_IDENTIFIERS:
-                            # trace
-                            attr.append(NODE_IDENTIFIERS[node.node_type])
-
-                attr = "".join(attr)
-                if hasattr(circuit, attr):
-                    getattr(circuit, attr)(*args)
+        qiskit = load_qiskit()
+        register = qiskit.QuantumRegister(self.max_wires, "q")
+        circuit = qiskit.QuantumCircuit(register)
+
+        for _, gate_name, targets, controls, radians in self.get_instructions():
+            args = [register[wire_num] for wire_num in controls + targets]
+            if gate_name in ROTATION_GATES:
+                args.insert(0, radians)
+            getattr(circuit, "c" * len(controls) + gate_name)(*args)
 
         return circuit
 
+    def get_circuit(self):
+        """
+        Get the Qiskit circuit for the grid, constructing it only when
+        first needed after a change
+        """
+        if self.circuit is None:
+            self.circuit = self.construct_circuit()
+        return self.circuit
+
+    def get_instructions(self):
+        """
+        Get the compiled instructions of the grid, rebuilt only when the
+        grid changes. Simulation backends and construct_circuit consume
+        this list instead of the nodes.
+
+        Returns:
+            tuple: (column number, gate name, target wires, control wires,
+            radians) tuples
+        """
+        return self.get_fingerprint()[1]
+
+    def invalidate(self):
+        """
+        Drop the compiled instructions, optimized gates, simulation key
+        and circuit after the grid changed
+        """
+        self.fingerprint = None
+        self.gates = None
+        self.simulation_key = None
+        self.circuit = None
+
+    def get_fingerprint(self):
+        """
+        Get a key for the gates currently on the grid, including the
+        columns they are placed in
+        """
+        if self.fingerprint is None:
+            self.fingerprint = circuit_fingerprint(self.nodes)
+        return self.fingerprint
+
+    def get_gates(self):
+        """
+        Get the gates to simulate, after removing cancelling pairs,
+        merging rotations and skipping empty columns
+
+        Returns:
+            list: (column number, gate name, target wires, control wires,
+            radians) tuples
+        """
+        if self.gates is None:
+            self.gates = optimize_gates(self.get_instructions())
+        return self.gates
+
+    def get_simulation_key(self):
+        """
+        Get the key under which simulation results are cached. Grids
+        whose optimized gates differ only in empty columns or in the
+        order of commuting gates on disjoint wires share a key.
+        """
+        if self.simulation_key is None:
+            self.simulation_key = canonical_key(self.max_wires, self.get_gates())
+        return self.simulation_key
+
+    def get_optimization_stats(self):
+        """
+        Get how much the peephole optimizer reduced the circuit
+
+        Returns:
+            dict: gate counts before and after optimization, number of
+            eliminated gates, and the number of columns left to simulate
+        """
+        gates = self.get_instructions()
+        optimized_gates = self.get_gates()
+        return {
+            "gates": len(gates),
+            "optimized_gates": len(optimized_gates),
+            "eliminated": len(gates) - len(optimized_gates),
+            "depth": len({gate[0] for gate in optimized_gates}),
+        }
+
+    def get_backend(self):
+        """
+        Get the simulation backend for the gates currently on the grid
+        """
+        return self.simulation.get_backend(self.get_gates())
+
+    def simulate(self):
+        """
+        Simulate the circuit grid with the native statevector simulator,
+        reusing cached results for circuits that were simulated before
+
+        Returns:
+            tuple: read-only (statevector, probabilities)
+        """
+        return self.simulation.simulate(self.get_simulation_key(), self.get_gates())
+
+    def get_sampler(self):
+        """
+        Get the measurement sampler for the current circuit
+
+        Returns:
+            AliasSampler or StabilizerSampler: sampler for measuring all wires
+        """
+        return self.simulation.get_sampler(self.get_simulation_key(), self.get_gates())
+
+    def get_statevector(self):
+        """
+        Simulate the circuit grid with the native statevector simulator
+
+        Returns:
+            ndarray: statevector, with wire 0 as the least significant bit
+        """
+        return self.simulate()[0]
+
+    def get_probabilities(self):
+        """
+        Get the probability of measuring each computational basis state
+        """
+        return self.get_sampler().probabilities()
+
+    def measure(self):
+        """
+        Measure all wires
+
+        Returns:
+            integer: measured basis state, with wire 0 as the least
+            significant bit
+        """
+        return self.get_sampler().sample()
+
+    def measure_batch(self, shots):
+        """
+        Measure all wires of many copies of the circuit
+
+        Parameters:
+        shots (integer): number of measurements
+
+        Returns:
+            ndarray: measured basis states
+        """
+        return self.get_sampler().sample_batch(shots)
+
     def reset_circuit(self):
         """
         Reset circuit by reinitializing nodes matrix
         """
-        self.nodes = np.full(
-            (self.max_wires, self.max_columns),
-            CircuitGridNode(node_types.EMPTY),
-            dtype=CircuitGridNode,
-        )
+        self.version += 1
+        self.invalidate()
+        empty_node = EMPTY_NODE.tolist()
+        wires, columns = np.nonzero(self.nodes != EMPTY_NODE)
+        edits = [
+            (
+                wire_num,
+                column_num,
+                self.nodes[wire_num, column_num].tolist(),
+                empty_node,
+            )
+            for wire_num, column_num in zip(wires.tolist(), columns.tolist())
+        ]
+        self.nodes.fill(EMPTY_NODE)
+        self.control_owners.fill(-1)
+        self.swap_owners.fill(-1)
+        self.notify(self.all_cells(), edits)
+
+    def all_cells(self):
+        """
+        Get (wire number, column number) of every cell on the grid
+        """
+        return {
+            (wire_num, column_num)
+            for wire_num in range(self.max_wires)
+            for column_num in range(self.max_columns)
+        }
+
+    def load_nodes(self, nodes):
+        """
+        Replace all nodes at once, e.g. with nodes read from a file
+
+        Parameters:
+        nodes (ndarray): (max_wires, max_columns) array of NODE_DTYPE records
+        """
+        edits = []
+        if self.listeners:
+            wires, columns = np.nonzero(self.nodes != nodes)
+            edits = [
+                (
+                    wire_num,
+                    column_num,
+                    self.nodes[wire_num, column_num].tolist(),
+                    nodes[wire_num, column_num].tolist(),
+                )
+                for wire_num, column_num in zip(wires.tolist(), columns.tolist())
+            ]
+        self.version += 1
+        self.invalidate()
+        self.nodes[...] = nodes
+
+        self.control_owners.fill(-1)
+        self.swap_owners.fill(-1)
+        wires, columns = np.indices(self.nodes.shape)
+        for field, owners in (
+            ("ctrl_a", self.control_owners),
+            ("ctrl_b", self.control_owners),
+            ("swap", self.swap_owners),
+        ):
+            referenced = self.nodes[field]
+            mask = (referenced >= 0) & (referenced < self.max_wires)
+            # the highest gate wire owns a cell, as in index_cell
+            np.maximum.at(owners, (referenced[mask], columns[mask]), wires[mask])
+
+        if self.listeners:
+            self.notify(self.all_cells(), edits)
+
+
+# pylint: disable=too-few-public-methods
+class CircuitGridChange:
+    """
+    Describes an edit of a circuit grid model
+    """
+
+    def __init__(self, version, cells, edits=()):
+        self.version = version
+        self.cells = frozenset(cells)
+        # (wire number, column number, old fields, new fields) per node
+        # written, with fields as (node_type, radians, ctrl_a, ctrl_b, swap)
+        self.edits = tuple(edits)
+        self.columns = sorted({column_num for _, column_num in self.cells})
+
+    def __str__(self):
+        return "version: " + str(self.version) + ", columns: " + str(self.columns)
 
 
 class CircuitGridNode:
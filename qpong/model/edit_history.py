@@ -0,0 +1,134 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Undo and redo of circuit grid edits
+"""
+
+from collections import deque
+
+from qpong.model.circuit_grid_model import CircuitGridNode
+
+DEFAULT_HISTORY_SIZE = 100
+
+
+class EditHistory:
+    """
+    Records the edits of a circuit grid model as undoable steps. A step
+    keeps only the old and new fields of the nodes it wrote, and the
+    oldest steps are dropped once max_steps are stored.
+    """
+
+    def __init__(self, circuit_grid_model, max_steps=DEFAULT_HISTORY_SIZE):
+        self.circuit_grid_model = circuit_grid_model
+        self.undo_steps = deque(maxlen=max_steps)
+        self.redo_steps = deque(maxlen=max_steps)
+        # edits made since the last step was closed
+        self.pending = []
+        self.replaying = False
+        circuit_grid_model.add_listener(self.handle_model_change)
+
+    def handle_model_change(self, change):
+        """
+        Record the node edits of a model change
+
+        Parameters:
+        change (CircuitGridChange): edit of the circuit grid model
+        """
+        if not self.replaying:
+            self.pending.extend(change.edits)
+
+    def end_step(self):
+        """
+        Close the edits made since the last call into one undoable step.
+        A new step discards the steps that could be redone.
+        """
+        if self.pending:
+            self.undo_steps.append(tuple(self.pending))
+            self.pending = []
+            self.redo_steps.clear()
+
+    def clear(self):
+        """
+        Forget all recorded edits, e.g. when a new game starts
+        """
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+        self.pending = []
+
+    def can_undo(self):
+        """
+        Check if there is an edit to undo
+        """
+        return bool(self.pending or self.undo_steps)
+
+    def can_redo(self):
+        """
+        Check if there is an undone edit to redo
+        """
+        return not self.pending and bool(self.redo_steps)
+
+    def undo(self):
+        """
+        Revert the last step, writing back only the nodes it changed
+
+        Returns:
+            boolean: True if a step was reverted
+        """
+        self.end_step()
+        if not self.undo_steps:
+            return False
+        step = self.undo_steps.pop()
+        self.replay(
+            (wire_num, column_num, old_fields)
+            for wire_num, column_num, old_fields, _ in reversed(step)
+        )
+        self.redo_steps.append(step)
+        return True
+
+    def redo(self):
+        """
+        Apply the last undone step again
+
+        Returns:
+            boolean: True if a step was applied
+        """
+        self.end_step()
+        if not self.redo_steps:
+            return False
+        step = self.redo_steps.pop()
+        self.replay(
+            (wire_num, column_num, new_fields)
+            for wire_num, column_num, _, new_fields in step
+        )
+        self.undo_steps.append(step)
+        return True
+
+    def replay(self, writes):
+        """
+        Write node fields to the model without recording them
+
+        Parameters:
+        writes (iterable): (wire number, column number, fields) to write
+        """
+        self.replaying = True
+        try:
+            for wire_num, column_num, fields in writes:
+                self.circuit_grid_model.set_node(
+                    wire_num, column_num, CircuitGridNode(*fields)
+                )
+        finally:
+            self.replaying = False
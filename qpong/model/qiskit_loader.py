@@ -0,0 +1,32 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Deferred import of Qiskit, which is only needed to build QuantumCircuit
+objects and takes longer to import than the rest of the game
+"""
+
+import importlib
+
+
+def load_qiskit():
+    """
+    Import Qiskit on first use
+
+    Returns:
+        module: the qiskit package
+    """
+    return importlib.import_module("qiskit")
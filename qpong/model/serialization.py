@@ -0,0 +1,225 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Saving and loading circuit grid models
+
+A binary record is a header followed by the node records of the grid
+in row-major (wire, column) order:
+
+    magic       4 bytes   b"QPNG"
+    version     uint8     FORMAT_VERSION
+    max_wires   uint16
+    max_columns uint16
+    nodes       max_wires * max_columns * FILE_NODE_DTYPE
+
+All numbers are little-endian. Files hold any number of records back
+to back.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from qpong.model.circuit_grid_model import CircuitGridModel, EMPTY_NODE, NODE_DTYPE
+
+MAGIC = b"QPNG"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sBHH")
+
+FILE_NODE_DTYPE = NODE_DTYPE.newbyteorder("<")
+
+NODE_FIELDS = NODE_DTYPE.names
+
+
+def dumps(circuit_grid_model):
+    """
+    Serialize a circuit grid model to a binary record
+
+    Parameters:
+    circuit_grid_model (CircuitGridModel): model to be serialized
+
+    Returns:
+        bytes: the record
+    """
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        circuit_grid_model.max_wires,
+        circuit_grid_model.max_columns,
+    )
+    return header + circuit_grid_model.nodes.astype(FILE_NODE_DTYPE).tobytes()
+
+
+def read_header(data):
+    """
+    Check and unpack a record header
+
+    Parameters:
+    data (bytes): at least HEADER.size bytes starting at a record
+
+    Returns:
+        tuple: (max_wires, max_columns)
+    """
+    magic, version, max_wires, max_columns = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a circuit grid record")
+    if version != FORMAT_VERSION:
+        raise ValueError("Unsupported circuit grid format version: " + str(version))
+    return max_wires, max_columns
+
+
+def nodes_size(max_wires, max_columns):
+    """
+    Get the size in bytes of the node records of a grid
+    """
+    return max_wires * max_columns * FILE_NODE_DTYPE.itemsize
+
+
+def model_from_nodes(max_wires, max_columns, data):
+    """
+    Build a circuit grid model from the node records of a binary record
+    """
+    circuit_grid_model = CircuitGridModel(max_wires, max_columns)
+    nodes = np.frombuffer(data, dtype=FILE_NODE_DTYPE, count=max_wires * max_columns)
+    circuit_grid_model.load_nodes(nodes.reshape(max_wires, max_columns))
+    return circuit_grid_model
+
+
+def loads(data):
+    """
+    Deserialize a circuit grid model from a binary record
+
+    Parameters:
+    data (bytes): the record
+
+    Returns:
+        CircuitGridModel: the model
+    """
+    max_wires, max_columns = read_header(data)
+    size = nodes_size(max_wires, max_columns)
+    if len(data) != HEADER.size + size:
+        raise ValueError("Circuit grid record has the wrong size")
+    return model_from_nodes(max_wires, max_columns, data[HEADER.size :])
+
+
+def dump(circuit_grid_model, file):
+    """
+    Append a circuit grid model to a binary file
+
+    Parameters:
+    circuit_grid_model (CircuitGridModel): model to be saved
+    file (file object): file opened for binary writing
+    """
+    file.write(dumps(circuit_grid_model))
+
+
+def iter_load(file):
+    """
+    Read the circuit grid models of a binary file one at a time,
+    without reading the whole file into memory
+
+    Parameters:
+    file (file object): file opened for binary reading
+
+    Yields:
+        CircuitGridModel: the next model in the file
+    """
+    while True:
+        header = file.read(HEADER.size)
+        if not header:
+            return
+        if len(header) < HEADER.size:
+            raise ValueError("Truncated circuit grid record")
+        max_wires, max_columns = read_header(header)
+        size = nodes_size(max_wires, max_columns)
+        data = file.read(size)
+        if len(data) < size:
+            raise ValueError("Truncated circuit grid record")
+        yield model_from_nodes(max_wires, max_columns, data)
+
+
+def load(file):
+    """
+    Read the first circuit grid model of a binary file
+
+    Parameters:
+    file (file object): file opened for binary reading
+
+    Returns:
+        CircuitGridModel: the model
+    """
+    for circuit_grid_model in iter_load(file):
+        return circuit_grid_model
+    raise ValueError("No circuit grid record in file")
+
+
+def to_json(circuit_grid_model):
+    """
+    Serialize a circuit grid model to JSON for debugging. Only nodes
+    with a field that differs from an empty node are listed.
+
+    Parameters:
+    circuit_grid_model (CircuitGridModel): model to be serialized
+
+    Returns:
+        string: the JSON document
+    """
+    nodes = circuit_grid_model.nodes
+    wires, columns = np.nonzero(nodes != EMPTY_NODE)
+    return json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "max_wires": circuit_grid_model.max_wires,
+            "max_columns": circuit_grid_model.max_columns,
+            "nodes": [
+                {
+                    "wire": wire_num,
+                    "column": column_num,
+                    **dict(zip(NODE_FIELDS, nodes[wire_num, column_num].tolist())),
+                }
+                for wire_num, column_num in zip(wires.tolist(), columns.tolist())
+            ],
+        }
+    )
+
+
+def from_json(text):
+    """
+    Deserialize a circuit grid model from JSON written by to_json
+
+    Parameters:
+    text (string): the JSON document
+
+    Returns:
+        CircuitGridModel: the model
+    """
+    document = json.loads(text)
+    if document.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            "Unsupported circuit grid format version: " + str(document.get("version"))
+        )
+    circuit_grid_model = CircuitGridModel(
+        document["max_wires"], document["max_columns"]
+    )
+    nodes = circuit_grid_model.nodes.copy()
+    for node in document["nodes"]:
+        nodes[node["wire"], node["column"]] = tuple(
+            node[field] for field in NODE_FIELDS
+        )
+    circuit_grid_model.load_nodes(nodes)
+    return circuit_grid_model
@@ -0,0 +1,31 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Native simulation of the circuit grid
+"""
+
+from .gates import node_gate, grid_gates, is_clifford_gate
+from .optimizer import optimize_gates
+from .statevector_simulator import StatevectorSimulator
+from .stabilizer_simulator import StabilizerSimulator
+from .column_cache import ColumnPrefixCache
+from .result_cache import CachedSimulation, SimulationCache, circuit_fingerprint
+from .canonical import canonical_key
+from .sampler import AliasSampler, StabilizerSampler
+from .simulation import CircuitSimulation, STATEVECTOR_BACKEND, STABILIZER_BACKEND
+from .worker import SimulationWorker
+from .batch_simulator import BatchSimulator
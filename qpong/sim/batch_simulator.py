@@ -0,0 +1,228 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+NumPy simulator evolving many circuit grids at once
+"""
+
+import numpy as np
+
+from qpong.sim.gates import (
+    GATE_MATRICES,
+    QUANTIZATION_TOLERANCE,
+    ROTATION_MATRICES,
+    ROTATION_STEP,
+    ROTATION_STEPS,
+)
+
+
+def gate_matrices(gate_name, radians):
+    """
+    Get the 2x2 matrices of a single-qubit gate for many angles
+
+    Parameters:
+    gate_name (string): gate name without control prefixes
+    radians (ndarray): angle of rotation of each matrix
+
+    Returns:
+        ndarray: matrices with shape (len(radians), 2, 2)
+    """
+    if gate_name in GATE_MATRICES:
+        return np.broadcast_to(GATE_MATRICES[gate_name], (len(radians), 2, 2))
+
+    steps = radians / ROTATION_STEP
+    rounded = np.round(steps)
+    if np.all(np.abs(steps - rounded) < QUANTIZATION_TOLERANCE):
+        indices = rounded.astype(int) % ROTATION_STEPS
+        return ROTATION_MATRICES[gate_name][indices]
+
+    matrices = np.zeros((len(radians), 2, 2), dtype=complex)
+    cos = np.cos(radians / 2)
+    sin = np.sin(radians / 2)
+    if gate_name == "rx":
+        matrices[:, 0, 0] = matrices[:, 1, 1] = cos
+        matrices[:, 0, 1] = matrices[:, 1, 0] = -1j * sin
+    elif gate_name == "ry":
+        matrices[:, 0, 0] = matrices[:, 1, 1] = cos
+        matrices[:, 0, 1] = -sin
+        matrices[:, 1, 0] = sin
+    else:
+        matrices[:, 0, 0] = np.exp(-0.5j * radians)
+        matrices[:, 1, 1] = np.exp(0.5j * radians)
+    return matrices
+
+
+class BatchSimulator:
+    """
+    Simulates many gate lists on a (batch, 2**num_qubits) array of
+    statevectors. Gates at the same column and wire of different
+    gate lists are applied together, so grids that differ in a few
+    cells cost little more than one grid.
+
+    Basis states are ordered like Qiskit's: wire 0 is the least
+    significant bit of the basis state index.
+    """
+
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+
+    def subspace(self, tensor, controls, fixed):
+        """
+        Get a view of the amplitudes of every statevector where all
+        control qubits are 1 and the qubits in fixed take the given values
+
+        Parameters:
+        tensor (ndarray): statevectors with one axis per qubit after
+        the batch axis
+        controls (tuple): control qubits
+        fixed (dict): qubit to bit value
+        """
+        index = [slice(None)] * (self.num_qubits + 1)
+        for qubit in controls:
+            index[self.num_qubits - qubit] = slice(1, 2)
+        for qubit, bit in fixed.items():
+            index[self.num_qubits - qubit] = slice(bit, bit + 1)
+        return tensor[tuple(index)]
+
+    def apply_matrices(self, tensor, matrices, target, controls=()):
+        """
+        Apply one single-qubit gate matrix per statevector in place
+
+        Parameters:
+        tensor (ndarray): statevectors with one axis per qubit
+        matrices (ndarray): (batch, 2, 2) gate matrices
+        target (integer): target qubit
+        controls (tuple): control qubits
+        """
+        amps0 = self.subspace(tensor, controls, {target: 0})
+        amps1 = self.subspace(tensor, controls, {target: 1})
+        shape = (len(matrices),) + (1,) * self.num_qubits
+        m00, m01, m10, m11 = (
+            matrices[:, row, col].reshape(shape) for row in (0, 1) for col in (0, 1)
+        )
+        scratch = amps0.copy()
+        amps0 *= m00
+        amps0 += m01 * amps1
+        amps1 *= m11
+        amps1 += m10 * scratch
+
+    def apply_swap(self, tensor, qubit_a, qubit_b, controls=()):
+        """
+        Swap two qubits of every statevector in place
+
+        Parameters:
+        tensor (ndarray): statevectors with one axis per qubit
+        qubit_a (integer): first qubit
+        qubit_b (integer): second qubit
+        controls (tuple): control qubits
+        """
+        amps01 = self.subspace(tensor, controls, {qubit_a: 0, qubit_b: 1})
+        amps10 = self.subspace(tensor, controls, {qubit_a: 1, qubit_b: 0})
+        scratch = amps01.copy()
+        np.copyto(amps01, amps10)
+        np.copyto(amps10, scratch)
+
+    def apply_gates(self, tensor, gate_name, targets, controls, radians):
+        """
+        Apply the same gate, with an angle per statevector, in place
+
+        Parameters:
+        tensor (ndarray): statevectors with one axis per qubit
+        gate_name (string): gate name without control prefixes
+        targets (tuple): target qubits
+        controls (tuple): control qubits
+        radians (ndarray): angle of rotation for each statevector
+        """
+        if gate_name == "swap":
+            self.apply_swap(tensor, targets[0], targets[1], controls)
+        else:
+            matrices = gate_matrices(gate_name, radians)
+            self.apply_matrices(tensor, matrices, targets[0], controls)
+
+    @staticmethod
+    def slots(gate_lists):
+        """
+        Group the gates of many gate lists by their place on the grid
+
+        Parameters:
+        gate_lists (list): gate lists as returned by grid_gates
+
+        Returns:
+            list: for each (column, wire) slot in application order, a
+            dict mapping (gate name, targets, controls) to lists of
+            (batch index, radians)
+        """
+        slots = {}
+        for batch_num, gates in enumerate(gate_lists):
+            for column_num, gate_name, targets, controls, radians in gates:
+                groups = slots.setdefault((column_num, targets[0]), {})
+                groups.setdefault((gate_name, targets, controls), []).append(
+                    (batch_num, radians)
+                )
+        return [slots[key] for key in sorted(slots)]
+
+    def run_gates(self, gate_lists):
+        """
+        Simulate many gate lists starting from |0...0>
+
+        Parameters:
+        gate_lists (list): gate lists as returned by grid_gates or
+        CircuitGridModel.get_gates, in grid order
+
+        Returns:
+            ndarray: (batch, 2**num_qubits) statevectors
+        """
+        batch = len(gate_lists)
+        states = np.zeros((batch, 2**self.num_qubits), dtype=complex)
+        states[:, 0] = 1
+        tensor = states.reshape((batch,) + (2,) * self.num_qubits)
+
+        for groups in self.slots(gate_lists):
+            for (gate_name, targets, controls), members in groups.items():
+                rows, radians = zip(*members)
+                radians = np.array(radians)
+                if len(rows) == batch:
+                    self.apply_gates(tensor, gate_name, targets, controls, radians)
+                else:
+                    rows = np.array(rows)
+                    selected = tensor[rows]
+                    self.apply_gates(selected, gate_name, targets, controls, radians)
+                    tensor[rows] = selected
+        return states
+
+    def run_models(self, circuit_grid_models):
+        """
+        Simulate the current circuits of many circuit grid models
+
+        Parameters:
+        circuit_grid_models (list): models with num_qubits wires
+
+        Returns:
+            ndarray: (batch, 2**num_qubits) statevectors
+        """
+        return self.run_gates([model.get_gates() for model in circuit_grid_models])
+
+    def probabilities(self, gate_lists):
+        """
+        Get the basis state probabilities of many gate lists
+
+        Parameters:
+        gate_lists (list): gate lists in grid order
+
+        Returns:
+            ndarray: (batch, 2**num_qubits) probabilities
+        """
+        return np.abs(self.run_gates(gate_lists)) ** 2
@@ -0,0 +1,84 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Canonical keys identifying circuits that prepare the same state
+"""
+
+
+def gate_layers(gates):
+    """
+    Schedule gates into layers as early as possible: each gate goes in
+    the layer after the last gate sharing a wire with it. Gates on
+    disjoint wires commute, so reordering them or moving them across
+    empty columns does not change the layers.
+
+    Parameters:
+    gates (list): gates as returned by grid_gates, in application order
+
+    Returns:
+        list: lists of gates on disjoint wires, in application order
+    """
+    layers = []
+    # for each wire, index of the layer of the last gate touching it
+    wire_layers = {}
+
+    for gate in gates:
+        _, _, targets, controls, _ = gate
+        wires = targets + controls
+        layer_num = 1 + max((wire_layers.get(wire, -1) for wire in wires), default=-1)
+        if layer_num == len(layers):
+            layers.append([])
+        layers[layer_num].append(gate)
+        for wire in wires:
+            wire_layers[wire] = layer_num
+
+    return layers
+
+
+def canonical_gate(gate):
+    """
+    Get a gate without its column, with wires in a canonical order
+
+    Parameters:
+    gate (tuple): gate as returned by grid_gates
+
+    Returns:
+        tuple: (gate name, target wires, control wires, radians)
+    """
+    _, gate_name, targets, controls, radians = gate
+    if gate_name == "swap":
+        targets = tuple(sorted(targets))
+    return gate_name, targets, tuple(sorted(controls)), radians
+
+
+def canonical_key(num_wires, gates):
+    """
+    Get a hashable key that is equal for gate lists differing only in
+    empty columns or in the order of commuting gates on disjoint wires
+
+    Parameters:
+    num_wires (integer): number of wires of the circuit
+    gates (list): gates as returned by grid_gates, in application order
+
+    Returns:
+        tuple: number of wires and the layers of canonical gates, sorted
+        by wire within each layer
+    """
+    return num_wires, tuple(
+        tuple(sorted(canonical_gate(gate) for gate in layer))
+        for layer in gate_layers(gates)
+    )
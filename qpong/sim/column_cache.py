@@ -0,0 +1,140 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Cache of intermediate statevectors after each circuit grid column
+"""
+
+import numpy as np
+
+from qpong.sim.statevector_simulator import StatevectorSimulator
+
+
+class ColumnPrefixCache:
+    """
+    Keeps the statevector after each column so that an edit only
+    re-simulates from the first changed column onward. Columns without
+    gates are skipped and hold no cached state.
+    """
+
+    def __init__(self, num_qubits, max_columns):
+        self.num_qubits = num_qubits
+        self.max_columns = max_columns
+        # statevectors are allocated on first use, so that Clifford-only
+        # grids with many wires never pay for them
+        self.simulator = None
+        self.column_states = None
+        # gates of the last run, and the column number of each cached state
+        self.gates = []
+        self.state_columns = []
+
+        self.hits = 0
+        self.misses = 0
+        self.columns_simulated = 0
+        self.last_columns_simulated = 0
+
+    def invalidate(self, column_num=0):
+        """
+        Discard cached states from a column onward
+
+        Parameters:
+        column_num (integer): first column that changed
+        """
+        while self.state_columns and self.state_columns[-1] >= column_num:
+            self.state_columns.pop()
+        self.gates = [gate for gate in self.gates if gate[0] < column_num]
+
+    def first_changed_column(self, gates):
+        """
+        Get the first column where gates differ from the last run
+
+        Parameters:
+        gates (list): gates as returned by grid_gates, in column order
+
+        Returns:
+            integer: column number, or None if nothing changed
+        """
+        for old_gate, new_gate in zip(self.gates, gates):
+            if old_gate != new_gate:
+                return min(old_gate[0], new_gate[0])
+        if len(self.gates) > len(gates):
+            return self.gates[len(gates)][0]
+        if len(gates) > len(self.gates):
+            return gates[len(self.gates)][0]
+        return None
+
+    def run(self, gates):
+        """
+        Get the statevector after the last column, re-simulating
+        only the columns that changed since the last run
+
+        Parameters:
+        gates (list): gates as returned by grid_gates, in column order
+
+        Returns:
+            ndarray: the statevector
+        """
+        if self.simulator is None:
+            self.simulator = StatevectorSimulator(self.num_qubits)
+            self.column_states = np.empty(
+                (self.max_columns, 2**self.num_qubits), dtype=complex
+            )
+
+        changed_column = self.first_changed_column(gates)
+        if changed_column is not None:
+            self.invalidate(changed_column)
+        else:
+            changed_column = self.max_columns
+
+        resumed = len(self.state_columns)
+        if resumed > 0:
+            self.hits += 1
+            np.copyto(self.simulator.state, self.column_states[resumed - 1])
+        else:
+            self.misses += 1
+            self.simulator.reset()
+
+        self.last_columns_simulated = 0
+        for index, gate in enumerate(gates):
+            if gate[0] < changed_column:
+                continue
+            self.simulator.apply_gate(*gate[1:])
+            if index + 1 == len(gates) or gates[index + 1][0] != gate[0]:
+                # last gate of its column
+                np.copyto(
+                    self.column_states[len(self.state_columns)], self.simulator.state
+                )
+                self.state_columns.append(gate[0])
+                self.last_columns_simulated += 1
+
+        self.gates = list(gates)
+        self.columns_simulated += self.last_columns_simulated
+
+        return self.simulator.state
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: hits, misses, total and last number of columns simulated
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "columns_simulated": self.columns_simulated,
+            "last_columns_simulated": self.last_columns_simulated,
+        }
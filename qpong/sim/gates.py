@@ -0,0 +1,236 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Gate definitions and the mapping from circuit grid nodes to gates
+"""
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+
+GATE_NAMES = {
+    node_types.X: "x",
+    node_types.Y: "y",
+    node_types.Z: "z",
+    node_types.S: "s",
+    node_types.SDG: "sdg",
+    node_types.T: "t",
+    node_types.TDG: "tdg",
+    node_types.H: "h",
+}
+
+# Gates (with their "c" prefixes for controls) that a node can turn into.
+# Each is a QuantumCircuit method that CircuitGridModel.construct_circuit
+# calls by name. Nodes without a matching method (e.g. "ct", "ccy") are
+# skipped.
+SUPPORTED_GATES = {
+    "x",
+    "y",
+    "z",
+    "s",
+    "sdg",
+    "t",
+    "tdg",
+    "h",
+    "rx",
+    "ry",
+    "rz",
+    "swap",
+    "cx",
+    "cy",
+    "cz",
+    "cs",
+    "csdg",
+    "ch",
+    "crx",
+    "cry",
+    "crz",
+    "cswap",
+    "ccx",
+    "ccz",
+}
+
+# Gates the stabilizer simulator can apply
+CLIFFORD_GATES = {"x", "y", "z", "s", "sdg", "h", "swap", "cx", "cy", "cz"}
+
+INV_SQRT2 = 1 / np.sqrt(2)
+
+GATE_MATRICES = {
+    "x": np.array([[0, 1], [1, 0]], dtype=complex),
+    "y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "z": np.array([[1, 0], [0, -1]], dtype=complex),
+    "s": np.array([[1, 0], [0, 1j]], dtype=complex),
+    "sdg": np.array([[1, 0], [0, -1j]], dtype=complex),
+    "t": np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=complex),
+    "tdg": np.array([[1, 0], [0, np.exp(-1j * np.pi / 4)]], dtype=complex),
+    "h": np.array([[INV_SQRT2, INV_SQRT2], [INV_SQRT2, -INV_SQRT2]], dtype=complex),
+}
+
+
+def rotation_matrix(gate_name, radians):
+    """
+    Get the matrix of a rotation gate
+
+    Parameters:
+    gate_name (string): one of "rx", "ry" or "rz"
+    radians (float): angle of rotation (in radians)
+    """
+    cos = np.cos(radians / 2)
+    sin = np.sin(radians / 2)
+    if gate_name == "rx":
+        return np.array([[cos, -1j * sin], [-1j * sin, cos]], dtype=complex)
+    if gate_name == "ry":
+        return np.array([[cos, -sin], [sin, cos]], dtype=complex)
+    return np.array(
+        [[np.exp(-0.5j * radians), 0], [0, np.exp(0.5j * radians)]], dtype=complex
+    )
+
+
+# The circuit grid rotates gates in steps of pi / 8, and the optimizer
+# merges rotations modulo 4 pi, so rotations almost always take one of
+# these angles. Their matrices are computed once.
+ROTATION_STEP = np.pi / 8
+ROTATION_STEPS = 32
+QUANTIZATION_TOLERANCE = 1e-9
+
+
+def rotation_table(gate_name):
+    """
+    Get the read-only matrices of a rotation gate at every multiple
+    of ROTATION_STEP in [0, 4 pi)
+
+    Parameters:
+    gate_name (string): one of "rx", "ry" or "rz"
+
+    Returns:
+        ndarray: matrices with shape (ROTATION_STEPS, 2, 2)
+    """
+    table = np.array(
+        [
+            rotation_matrix(gate_name, step * ROTATION_STEP)
+            for step in range(ROTATION_STEPS)
+        ]
+    )
+    table.flags.writeable = False
+    return table
+
+
+ROTATION_MATRICES = {
+    gate_name: rotation_table(gate_name) for gate_name in ("rx", "ry", "rz")
+}
+
+
+def gate_matrix(gate_name, radians=0.0):
+    """
+    Get the 2x2 matrix of a single-qubit gate. Controlled gates use the
+    matrix of their target gate.
+
+    Parameters:
+    gate_name (string): gate name without control prefixes
+    radians (float): angle of rotation for rotation gates
+    """
+    if gate_name in GATE_MATRICES:
+        return GATE_MATRICES[gate_name]
+    steps = radians / ROTATION_STEP
+    step = round(steps)
+    if abs(steps - step) < QUANTIZATION_TOLERANCE:
+        return ROTATION_MATRICES[gate_name][step % ROTATION_STEPS]
+    return rotation_matrix(gate_name, radians)
+
+
+def node_gate(node, wire_num):
+    """
+    Get the gate a circuit grid node applies
+
+    Parameters:
+    node (CircuitGridNode): node on the circuit grid
+    wire_num (integer): wire number of the node
+
+    Returns:
+        tuple: (gate name, target wires, control wires, radians), or None
+        if the node does not apply a gate.
+    """
+    return cell_gate(
+        wire_num,
+        (node.node_type, node.radians, node.ctrl_a, node.ctrl_b, node.swap),
+    )
+
+
+def cell_gate(wire_num, fields):
+    """
+    Get the gate a circuit grid cell applies
+
+    Parameters:
+    wire_num (integer): wire number of the cell
+    fields (tuple): (node type, radians, ctrl_a, ctrl_b, swap) of the node
+
+    Returns:
+        tuple: (gate name, target wires, control wires, radians), or None
+        if the cell does not apply a gate.
+    """
+    node_type, radians, ctrl_a, ctrl_b, swap = fields
+    controls = tuple(ctrl for ctrl in (ctrl_a, ctrl_b) if ctrl != -1)
+
+    if swap != -1:
+        gate_name = "swap"
+        targets = (wire_num, swap)
+    elif node_type in GATE_NAMES:
+        gate_name = GATE_NAMES[node_type]
+        if radians != 0:
+            gate_name = "r" + gate_name
+        targets = (wire_num,)
+    else:
+        return None
+
+    if "c" * len(controls) + gate_name not in SUPPORTED_GATES:
+        return None
+
+    return gate_name, targets, controls, radians
+
+
+def grid_gates(nodes):
+    """
+    Get the gates on a circuit grid in the order they are applied
+
+    Parameters:
+    nodes (ndarray): circuit grid node records indexed by wire and column
+
+    Returns:
+        list: (column number, gate name, target wires, control wires,
+        radians) tuples
+    """
+    occupied = np.isin(nodes["node_type"], list(GATE_NAMES)) | (nodes["swap"] != -1)
+    # transpose to visit the occupied cells column by column
+    columns, wires = np.nonzero(occupied.T)
+    gates = []
+    for column_num, wire_num in zip(columns.tolist(), wires.tolist()):
+        gate = cell_gate(wire_num, nodes[wire_num, column_num].tolist())
+        if gate is not None:
+            gates.append((column_num,) + gate)
+    return gates
+
+
+def is_clifford_gate(gate):
+    """
+    Check whether a gate from grid_gates is a Clifford gate
+
+    Parameters:
+    gate (tuple): (column number, gate name, target wires, control wires,
+    radians)
+    """
+    _, gate_name, _, controls, _ = gate
+    return "c" * len(controls) + gate_name in CLIFFORD_GATES
@@ -0,0 +1,116 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Peephole optimization of the gates on a circuit grid
+"""
+
+import numpy as np
+
+INVERSE_GATES = {
+    "x": "x",
+    "y": "y",
+    "z": "z",
+    "h": "h",
+    "s": "sdg",
+    "sdg": "s",
+    "t": "tdg",
+    "tdg": "t",
+    "swap": "swap",
+}
+
+ROTATION_GATES = ("rx", "ry", "rz")
+
+# rotations are the identity (not just up to a phase) at multiples of 4 pi
+ROTATION_PERIOD = 4 * np.pi
+
+
+def combine_gates(first, second):
+    # pylint: disable=too-many-return-statements
+    """
+    Combine two gates that act on the same wires with nothing in between
+
+    Parameters:
+    first (tuple): earlier gate, as returned by grid_gates
+    second (tuple): later gate, as returned by grid_gates
+
+    Returns:
+        list: gates replacing both ([] if they cancel), or None if they
+        cannot be combined
+    """
+    column_num, name1, targets1, controls1, radians1 = first
+    _, name2, targets2, controls2, radians2 = second
+
+    if set(controls1) != set(controls2):
+        return None
+    if name1 == "swap":
+        if set(targets1) != set(targets2):
+            return None
+    elif targets1 != targets2:
+        return None
+
+    if INVERSE_GATES.get(name1) == name2:
+        return []
+
+    if name1 == name2 and name1 in ROTATION_GATES:
+        radians = (radians1 + radians2) % ROTATION_PERIOD
+        if np.isclose(radians, 0) or np.isclose(radians, ROTATION_PERIOD):
+            return []
+        return [(column_num, name1, targets1, controls1, radians)]
+
+    return None
+
+
+def optimize_gates(gates):
+    """
+    Remove cancelling gate pairs and merge rotation chains. Two gates
+    are combined when no other gate touches their wires in between;
+    empty columns never appear in the result.
+
+    Parameters:
+    gates (list): gates as returned by grid_gates
+
+    Returns:
+        list: equivalent gates in application order
+    """
+    optimized = []
+    # for each wire, indices in optimized of the gates touching it
+    wire_gates = {}
+
+    for gate in gates:
+        _, _, targets, controls, _ = gate
+        wires = set(targets) | set(controls)
+        previous = {
+            wire_gates[wire][-1] if wire_gates.get(wire) else None for wire in wires
+        }
+
+        if len(previous) == 1 and None not in previous:
+            index = previous.pop()
+            combined = combine_gates(optimized[index], gate)
+            if combined == []:
+                optimized[index] = None
+                for wire in wires:
+                    wire_gates[wire].pop()
+                continue
+            if combined is not None:
+                optimized[index] = combined[0]
+                continue
+
+        optimized.append(gate)
+        for wire in wires:
+            wire_gates.setdefault(wire, []).append(len(optimized) - 1)
+
+    return [gate for gate in optimized if gate is not None]
@@ -0,0 +1,145 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+LRU cache of simulation results keyed by canonical circuit key
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from qpong.sim.gates import grid_gates
+
+DEFAULT_CACHE_SIZE = 256
+
+
+def circuit_fingerprint(nodes):
+    """
+    Get a canonical, hashable key for the gates on a circuit grid.
+    Nodes that do not apply a gate (e.g. TRACE) do not change the key.
+
+    Parameters:
+    nodes (ndarray): circuit grid nodes indexed by wire and column
+
+    Returns:
+        tuple: number of wires and the gates in column order
+    """
+    return nodes.shape[0], tuple(grid_gates(nodes))
+
+
+# pylint: disable=too-few-public-methods
+class CachedSimulation:
+    """
+    Simulation results of one circuit. Results that were not needed
+    yet are None, e.g. the statevector of a grid simulated with the
+    stabilizer backend.
+    """
+
+    def __init__(self):
+        self.statevector = None
+        self.probabilities = None
+        self.sampler = None
+
+    def set_statevector(self, statevector):
+        """
+        Store a statevector and its basis state probabilities. The arrays
+        are made read-only since they are shared with every later hit.
+
+        Parameters:
+        statevector (ndarray): simulated statevector
+        """
+        self.statevector = statevector
+        self.probabilities = np.abs(statevector) ** 2
+        self.statevector.setflags(write=False)
+        self.probabilities.setflags(write=False)
+
+
+class SimulationCache:
+    """
+    Bounded cache of simulation results. When full, the least
+    recently used entry is evicted.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Get cached results for a circuit key
+
+        Parameters:
+        key (tuple): canonical circuit key
+
+        Returns:
+            CachedSimulation: results, or None if not cached
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def add(self, key):
+        """
+        Add an empty entry for a circuit key, to be filled in by the caller
+
+        Parameters:
+        key (tuple): canonical circuit key
+
+        Returns:
+            CachedSimulation: the new entry
+        """
+        entry = CachedSimulation()
+        if self.max_size <= 0:
+            return entry
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def clear(self):
+        """
+        Remove all cached results
+        """
+        self.entries.clear()
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: size, hits, misses and evictions
+        """
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
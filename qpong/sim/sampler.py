@@ -0,0 +1,150 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Constant-time measurement sampling with the alias method
+"""
+
+import numpy as np
+
+
+class AliasSampler:
+    """
+    Samples basis states from a probability vector in constant time,
+    using a table built once with Vose's alias method
+    """
+
+    def __init__(self, probabilities, rng=None):
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.basis_probabilities = probabilities
+        self.size = len(probabilities)
+        self.prob = np.ones(self.size)
+        self.alias = np.arange(self.size)
+
+        scaled = np.asarray(probabilities, dtype=float) * (
+            self.size / np.sum(probabilities)
+        )
+        small = [idx for idx in range(self.size) if scaled[idx] < 1.0]
+        large = [idx for idx in range(self.size) if scaled[idx] >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # entries left over only differ from 1 by rounding error
+
+    def probabilities(self):
+        """
+        Get the probability of each basis state
+        """
+        return self.basis_probabilities
+
+    def sample(self):
+        """
+        Draw one basis state
+
+        Returns:
+            integer: basis state index
+        """
+        column = int(self.rng.integers(self.size))
+        if self.rng.random() < self.prob[column]:
+            return column
+        return int(self.alias[column])
+
+    def sample_batch(self, shots):
+        """
+        Draw many basis states in one call
+
+        Parameters:
+        shots (integer): number of samples
+
+        Returns:
+            ndarray: basis state indices
+        """
+        columns = self.rng.integers(self.size, size=shots)
+        keep = self.rng.random(shots) < self.prob[columns]
+        return np.where(keep, columns, self.alias[columns])
+
+
+class StabilizerSampler:
+    """
+    Samples basis states that are uniformly distributed over an affine
+    subspace, as measurement outcomes of a stabilizer state are. Sampling
+    takes polynomial time in the number of qubits.
+    """
+
+    def __init__(self, offset, basis, rng=None):
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.num_qubits = len(offset)
+        # bit vectors, with qubit 0 first
+        self.offset = np.asarray(offset, dtype=bool)
+        self.basis = np.asarray(basis, dtype=bool)
+        self.basis_probabilities = None
+
+    @staticmethod
+    def to_int(bits):
+        """
+        Convert a bit vector, with qubit 0 first, to a basis state index
+        """
+        return sum(1 << qubit for qubit in np.flatnonzero(bits))
+
+    def probabilities(self):
+        """
+        Get the probability of each basis state. This takes memory
+        exponential in the number of qubits and is computed once.
+        """
+        if self.basis_probabilities is None:
+            support = np.array([self.to_int(self.offset)])
+            for direction in self.basis:
+                support = np.concatenate([support, support ^ self.to_int(direction)])
+            self.basis_probabilities = np.zeros(2**self.num_qubits)
+            self.basis_probabilities[support] = 1 / len(support)
+            self.basis_probabilities.setflags(write=False)
+        return self.basis_probabilities
+
+    def sample(self):
+        """
+        Draw one basis state
+
+        Returns:
+            integer: basis state index
+        """
+        choice = self.rng.integers(2, size=len(self.basis)).astype(bool)
+        bits = self.offset ^ np.logical_xor.reduce(
+            self.basis[choice], axis=0, initial=False
+        )
+        return self.to_int(bits)
+
+    def sample_batch(self, shots):
+        """
+        Draw many basis states in one call. Indices are 64-bit integers,
+        so this is limited to 63 qubits.
+
+        Parameters:
+        shots (integer): number of samples
+
+        Returns:
+            ndarray: basis state indices
+        """
+        choices = self.rng.integers(2, size=(shots, len(self.basis)))
+        bits = (choices @ self.basis.astype(np.int64)) % 2 != self.offset
+        return bits.astype(np.int64) @ (1 << np.arange(self.num_qubits, dtype=np.int64))
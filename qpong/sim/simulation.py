@@ -0,0 +1,120 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Simulation of compiled circuit grid gates with caching and backend selection
+"""
+
+from qpong.sim.column_cache import ColumnPrefixCache
+from qpong.sim.gates import is_clifford_gate
+from qpong.sim.result_cache import DEFAULT_CACHE_SIZE, SimulationCache
+from qpong.sim.sampler import AliasSampler
+from qpong.sim.stabilizer_simulator import StabilizerSimulator
+
+STATEVECTOR_BACKEND = "statevector"
+STABILIZER_BACKEND = "stabilizer"
+
+
+class CircuitSimulation:
+    """
+    Simulates gate lists of one circuit grid size, keeping the caches
+    and the measurement sampler of the last circuit
+    """
+
+    def __init__(self, num_qubits, max_columns, cache_size=DEFAULT_CACHE_SIZE):
+        self.column_cache = ColumnPrefixCache(num_qubits, max_columns)
+        self.result_cache = SimulationCache(cache_size)
+        self.stabilizer_simulator = StabilizerSimulator(num_qubits)
+        self.sampler = None
+        self.sampler_key = None
+
+    @staticmethod
+    def get_backend(gates):
+        """
+        Get the simulation backend for a gate list. Gate lists with only
+        Clifford gates (no T, Tdg, rotation or multi-controlled gates)
+        use the stabilizer tableau backend.
+
+        Parameters:
+        gates (list): gates as returned by grid_gates
+        """
+        if all(is_clifford_gate(gate) for gate in gates):
+            return STABILIZER_BACKEND
+        return STATEVECTOR_BACKEND
+
+    def lookup(self, key):
+        """
+        Get the cached results for a circuit key, adding an empty
+        entry for circuits that were not simulated before
+
+        Parameters:
+        key (tuple): canonical circuit key
+
+        Returns:
+            CachedSimulation: results of the circuit
+        """
+        entry = self.result_cache.get(key)
+        if entry is None:
+            entry = self.result_cache.add(key)
+        return entry
+
+    def fill_statevector(self, entry, gates):
+        """
+        Simulate a gate list with the statevector simulator, unless
+        the entry already holds its statevector
+        """
+        if entry.statevector is None:
+            entry.set_statevector(self.column_cache.run(gates).copy())
+
+    def simulate(self, key, gates):
+        """
+        Simulate a gate list with the statevector simulator, reusing
+        cached results for circuits that were simulated before
+
+        Parameters:
+        key (tuple): canonical circuit key
+        gates (list): gates as returned by grid_gates
+
+        Returns:
+            tuple: read-only (statevector, probabilities)
+        """
+        entry = self.lookup(key)
+        self.fill_statevector(entry, gates)
+        return entry.statevector, entry.probabilities
+
+    def get_sampler(self, key, gates):
+        """
+        Get the measurement sampler for a gate list, building it with
+        the selected backend for circuits that were not sampled before
+
+        Parameters:
+        key (tuple): canonical circuit key
+        gates (list): gates as returned by grid_gates
+
+        Returns:
+            AliasSampler or StabilizerSampler: sampler for measuring all wires
+        """
+        if self.sampler_key != key:
+            entry = self.lookup(key)
+            if entry.sampler is None:
+                if self.get_backend(gates) == STABILIZER_BACKEND:
+                    entry.sampler = self.stabilizer_simulator.run_gates(gates)
+                else:
+                    self.fill_statevector(entry, gates)
+                    entry.sampler = AliasSampler(entry.probabilities)
+            self.sampler = entry.sampler
+            self.sampler_key = key
+        return self.sampler
@@ -0,0 +1,244 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Stabilizer tableau simulator for Clifford-only circuit grids
+"""
+
+import numpy as np
+
+from qpong.sim.gates import grid_gates
+from qpong.sim.sampler import StabilizerSampler
+
+
+class StabilizerSimulator:
+    """
+    Aaronson-Gottesman stabilizer tableau. Rows 0..n-1 are destabilizers
+    and rows n..2n-1 are stabilizers; memory is O(n^2) and each gate
+    is O(n), so the number of qubits is not limited by 2**n.
+    """
+
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        self.x = np.zeros((2 * num_qubits, num_qubits), dtype=bool)
+        self.z = np.zeros((2 * num_qubits, num_qubits), dtype=bool)
+        self.r = np.zeros(2 * num_qubits, dtype=bool)
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the tableau to |0...0>
+        """
+        num_qubits = self.num_qubits
+        self.x.fill(False)
+        self.z.fill(False)
+        self.r.fill(False)
+        self.x[range(num_qubits), range(num_qubits)] = True
+        self.z[range(num_qubits, 2 * num_qubits), range(num_qubits)] = True
+
+    def apply_h(self, qubit):
+        """
+        Apply a Hadamard gate
+        """
+        self.r ^= self.x[:, qubit] & self.z[:, qubit]
+        self.x[:, qubit], self.z[:, qubit] = (
+            self.z[:, qubit].copy(),
+            self.x[:, qubit].copy(),
+        )
+
+    def apply_s(self, qubit):
+        """
+        Apply an S gate
+        """
+        self.r ^= self.x[:, qubit] & self.z[:, qubit]
+        self.z[:, qubit] ^= self.x[:, qubit]
+
+    def apply_sdg(self, qubit):
+        """
+        Apply an S-dagger gate
+        """
+        self.r ^= self.x[:, qubit] & ~self.z[:, qubit]
+        self.z[:, qubit] ^= self.x[:, qubit]
+
+    def apply_pauli(self, gate_name, qubit):
+        """
+        Apply an X, Y or Z gate, which only changes signs
+        """
+        if gate_name in ("x", "y"):
+            self.r ^= self.z[:, qubit]
+        if gate_name in ("z", "y"):
+            self.r ^= self.x[:, qubit]
+
+    def apply_cx(self, control, target):
+        """
+        Apply a controlled-X gate
+        """
+        self.r ^= (
+            self.x[:, control]
+            & self.z[:, target]
+            & ~(self.x[:, target] ^ self.z[:, control])
+        )
+        self.x[:, target] ^= self.x[:, control]
+        self.z[:, control] ^= self.z[:, target]
+
+    def apply_gate(self, gate_name, targets, controls=(), radians=0.0):
+        # pylint: disable=unused-argument
+        """
+        Apply a Clifford gate
+
+        Parameters:
+        gate_name (string): gate name without control prefixes
+        targets (tuple): target qubits
+        controls (tuple): at most one control qubit
+        radians (float): unused, rotations are not Clifford gates
+        """
+        target = targets[0]
+        if controls:
+            control = controls[0]
+            if gate_name == "x":
+                self.apply_cx(control, target)
+            elif gate_name == "y":
+                self.apply_sdg(target)
+                self.apply_cx(control, target)
+                self.apply_s(target)
+            elif gate_name == "z":
+                self.apply_h(target)
+                self.apply_cx(control, target)
+                self.apply_h(target)
+            else:
+                raise ValueError("Not a Clifford gate: c" + gate_name)
+        elif gate_name in ("x", "y", "z"):
+            self.apply_pauli(gate_name, target)
+        elif gate_name == "h":
+            self.apply_h(target)
+        elif gate_name == "s":
+            self.apply_s(target)
+        elif gate_name == "sdg":
+            self.apply_sdg(target)
+        elif gate_name == "swap":
+            self.apply_cx(target, targets[1])
+            self.apply_cx(targets[1], target)
+            self.apply_cx(target, targets[1])
+        else:
+            raise ValueError("Not a Clifford gate: " + gate_name)
+
+    def run_gates(self, gates, rng=None):
+        """
+        Simulate a list of Clifford gates starting from |0...0>
+
+        Parameters:
+        gates (list): gates as returned by grid_gates
+        rng (Generator): random generator for the returned sampler
+
+        Returns:
+            StabilizerSampler: sampler for measuring all qubits
+        """
+        self.reset()
+        for gate in gates:
+            self.apply_gate(*gate[1:])
+        return self.sampler(rng)
+
+    def run(self, nodes, rng=None):
+        """
+        Simulate Clifford-only circuit grid nodes starting from |0...0>
+
+        Parameters:
+        nodes (ndarray): circuit grid nodes indexed by wire and column
+        rng (Generator): random generator for the returned sampler
+
+        Returns:
+            StabilizerSampler: sampler for measuring all qubits
+        """
+        return self.run_gates(grid_gates(nodes), rng)
+
+    @staticmethod
+    def rowsum(x, z, r, target, source):
+        """
+        Multiply row target by row source, keeping track of the sign
+        """
+        x1, z1 = x[source], z[source]
+        x2, z2 = x[target], z[target]
+        phase = np.sum(
+            np.where(
+                x1 & z1,
+                z2.astype(int) - x2,
+                np.where(
+                    x1,
+                    z2 * (2 * x2.astype(int) - 1),
+                    z1 * x2 * (1 - 2 * z2.astype(int)),
+                ),
+            )
+        )
+        r[target] = (2 * r[target] + 2 * r[source] + phase) % 4 != 0
+        x[target] ^= x1
+        z[target] ^= z1
+
+    def sampler(self, rng=None):
+        """
+        Get the measurement distribution of the current state. Measuring
+        all qubits gives a uniformly random point of an affine subspace
+        of basis states.
+
+        Parameters:
+        rng (Generator): random generator for the sampler
+
+        Returns:
+            StabilizerSampler: sampler for measuring all qubits
+        """
+        num_qubits = self.num_qubits
+        # scratch row at index 2n for deterministic measurements
+        x = np.vstack([self.x, np.zeros(num_qubits, dtype=bool)])
+        z = np.vstack([self.z, np.zeros(num_qubits, dtype=bool)])
+        r = np.append(self.r, False)
+
+        # one outcome of measuring every qubit, taking 0 for random outcomes
+        offset = np.zeros(num_qubits, dtype=bool)
+        for qubit in range(num_qubits):
+            anticommuting = np.flatnonzero(x[num_qubits : 2 * num_qubits, qubit])
+            if len(anticommuting) > 0:
+                pivot = num_qubits + anticommuting[0]
+                for row in np.flatnonzero(x[: 2 * num_qubits, qubit]):
+                    if row != pivot:
+                        self.rowsum(x, z, r, row, pivot)
+                x[pivot - num_qubits] = x[pivot]
+                z[pivot - num_qubits] = z[pivot]
+                r[pivot - num_qubits] = r[pivot]
+                x[pivot] = False
+                z[pivot] = False
+                z[pivot, qubit] = True
+                r[pivot] = False
+            else:
+                x[2 * num_qubits] = False
+                z[2 * num_qubits] = False
+                r[2 * num_qubits] = False
+                for row in np.flatnonzero(x[:num_qubits, qubit]):
+                    self.rowsum(x, z, r, 2 * num_qubits, row + num_qubits)
+                offset[qubit] = r[2 * num_qubits]
+
+        # the subspace is spanned by the X parts of the stabilizers
+        basis = []
+        rows = self.x[num_qubits:].copy()
+        for qubit in range(num_qubits):
+            pivots = np.flatnonzero(rows[:, qubit])
+            if len(pivots) == 0:
+                continue
+            pivot_row = rows[pivots[0]].copy()
+            rows[pivots] ^= pivot_row
+            basis.append(pivot_row)
+
+        return StabilizerSampler(
+            offset, np.array(basis, dtype=bool).reshape(-1, num_qubits), rng
+        )
@@ -0,0 +1,167 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+NumPy statevector simulator for the circuit grid
+"""
+
+import numpy as np
+
+from qpong.sim.gates import gate_matrix, grid_gates
+
+
+class StatevectorSimulator:
+    """
+    Simulates circuit grid nodes on a preallocated statevector.
+
+    Basis states are ordered like Qiskit's: wire 0 is the least
+    significant bit of the basis state index.
+    """
+
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        self.state = np.zeros(2**num_qubits, dtype=complex)
+        # view of the statevector with one axis per qubit
+        self.tensor = self.state.reshape((2,) * num_qubits)
+        self.scratch = np.empty(2 ** max(num_qubits - 1, 0), dtype=complex)
+        self.product = np.empty(2 ** max(num_qubits - 1, 0), dtype=complex)
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the statevector to |0...0>
+        """
+        self.state.fill(0)
+        self.state[0] = 1
+
+    def subspace(self, controls, fixed):
+        """
+        Get a view of the amplitudes where all control qubits are 1
+        and the qubits in fixed take the given values
+
+        Parameters:
+        controls (tuple): control qubits
+        fixed (dict): qubit to bit value
+        """
+        index = [slice(None)] * self.num_qubits
+        for qubit in controls:
+            index[self.num_qubits - 1 - qubit] = slice(1, 2)
+        for qubit, bit in fixed.items():
+            index[self.num_qubits - 1 - qubit] = slice(bit, bit + 1)
+        return self.tensor[tuple(index)]
+
+    @staticmethod
+    def buffer(buffer, shape):
+        """
+        Get a preallocated buffer shaped like a subspace
+        """
+        return buffer[: int(np.prod(shape))].reshape(shape)
+
+    def apply_matrix(self, matrix, target, controls=()):
+        """
+        Apply a single-qubit gate matrix in place
+
+        Parameters:
+        matrix (ndarray): 2x2 gate matrix
+        target (integer): target qubit
+        controls (tuple): control qubits
+        """
+        amps0 = self.subspace(controls, {target: 0})
+        amps1 = self.subspace(controls, {target: 1})
+
+        if matrix[0, 1] == 0 and matrix[1, 0] == 0:
+            # diagonal gate
+            if matrix[0, 0] != 1:
+                amps0 *= matrix[0, 0]
+            if matrix[1, 1] != 1:
+                amps1 *= matrix[1, 1]
+            return
+
+        scratch = self.buffer(self.scratch, amps0.shape)
+        product = self.buffer(self.product, amps0.shape)
+        np.copyto(scratch, amps0)
+
+        np.multiply(amps0, matrix[0, 0], out=amps0)
+        np.multiply(amps1, matrix[0, 1], out=product)
+        amps0 += product
+
+        np.multiply(amps1, matrix[1, 1], out=amps1)
+        np.multiply(scratch, matrix[1, 0], out=product)
+        amps1 += product
+
+    def apply_swap(self, qubit_a, qubit_b, controls=()):
+        """
+        Swap two qubits in place
+
+        Parameters:
+        qubit_a (integer): first qubit
+        qubit_b (integer): second qubit
+        controls (tuple): control qubits
+        """
+        amps01 = self.subspace(controls, {qubit_a: 0, qubit_b: 1})
+        amps10 = self.subspace(controls, {qubit_a: 1, qubit_b: 0})
+        scratch = self.buffer(self.scratch, amps01.shape)
+        np.copyto(scratch, amps01)
+        np.copyto(amps01, amps10)
+        np.copyto(amps10, scratch)
+
+    def apply_gate(self, gate_name, targets, controls=(), radians=0.0):
+        """
+        Apply a gate in place
+
+        Parameters:
+        gate_name (string): gate name without control prefixes
+        targets (tuple): target qubits
+        controls (tuple): control qubits
+        radians (float): angle of rotation for rotation gates
+        """
+        if gate_name == "swap":
+            self.apply_swap(targets[0], targets[1], controls)
+        else:
+            self.apply_matrix(gate_matrix(gate_name, radians), targets[0], controls)
+
+    def run_gates(self, gates):
+        """
+        Simulate a list of gates starting from |0...0>
+
+        Parameters:
+        gates (list): gates as returned by grid_gates
+
+        Returns:
+            ndarray: the statevector
+        """
+        self.reset()
+        for gate in gates:
+            self.apply_gate(*gate[1:])
+        return self.state
+
+    def run(self, nodes):
+        """
+        Simulate circuit grid nodes starting from |0...0>
+
+        Parameters:
+        nodes (ndarray): circuit grid nodes indexed by wire and column
+
+        Returns:
+            ndarray: the statevector
+        """
+        return self.run_gates(grid_gates(nodes))
+
+    def probabilities(self):
+        """
+        Get the probabilities of each basis state
+        """
+        return np.abs(self.state) ** 2
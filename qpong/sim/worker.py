@@ -0,0 +1,199 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Background simulation of the circuit grid
+"""
+
+import threading
+
+from qpong.sim.result_cache import DEFAULT_CACHE_SIZE
+from qpong.sim.simulation import CircuitSimulation
+
+
+class SimulationWorker:
+    """
+    Simulates circuit grid models on a background thread. Requests are
+    queued latest-wins: a request that has not been picked up yet is
+    replaced by a newer one, and results for versions older than the
+    last submitted one are discarded. An exception raised by a
+    simulation is kept as the result of its version and raised again
+    on the thread that polls or waits for it.
+    """
+
+    def __init__(self, num_qubits, max_columns, cache_size=DEFAULT_CACHE_SIZE):
+        self.simulation = CircuitSimulation(num_qubits, max_columns, cache_size)
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+        # (version, simulation key, gates) waiting to be simulated
+        self.pending = None
+        # (version, sampler, exception) of the last finished simulation
+        self.result = None
+        self.submitted_version = None
+        self.delivered_version = None
+        self.dropped_requests = 0
+        self.stale_results = 0
+
+    def start(self):
+        """
+        Start the worker thread if it is not running
+        """
+        with self.condition:
+            if self.running and self.thread is not None and self.thread.is_alive():
+                return
+            self.running = True
+        self.thread = threading.Thread(
+            target=self.run, name="qpong-simulation", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop the worker thread, dropping any pending request
+        """
+        with self.condition:
+            self.running = False
+            self.pending = None
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def submit(self, circuit_grid_model):
+        """
+        Request simulation of the current circuit of a model
+
+        Parameters:
+        circuit_grid_model (CircuitGridModel): model to be simulated
+        """
+        version = circuit_grid_model.version
+        with self.condition:
+            self.submitted_version = version
+            if (
+                self.result is not None
+                and self.result[0] == version
+                and self.result[2] is None
+            ):
+                # already simulated, deliver the result again
+                self.delivered_version = None
+                return
+            if self.result is not None and self.result[0] == version:
+                # simulate a failed version again
+                self.result = None
+            if self.pending is not None:
+                self.dropped_requests += 1
+            self.pending = (
+                version,
+                circuit_grid_model.get_simulation_key(),
+                circuit_grid_model.get_gates(),
+            )
+            self.condition.notify_all()
+        self.start()
+
+    def run(self):
+        """
+        Worker thread loop
+        """
+        while True:
+            with self.condition:
+                while self.running and self.pending is None:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                version, key, gates = self.pending
+                self.pending = None
+
+            sampler = None
+            exception = None
+            try:
+                sampler = self.simulation.get_sampler(key, gates)
+                # build the probability vector here rather than on the main thread
+                sampler.probabilities()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                # raised again on the main thread by poll or wait
+                exception = error
+
+            with self.condition:
+                if version == self.submitted_version:
+                    self.result = (version, sampler, exception)
+                    self.delivered_version = None
+                else:
+                    self.stale_results += 1
+                self.condition.notify_all()
+
+    def get_result(self):
+        """
+        Get the sampler of the last finished simulation, raising the
+        exception of the simulation if it failed. Call with the
+        condition held.
+
+        Returns:
+            AliasSampler or StabilizerSampler: sampler
+        """
+        _, sampler, exception = self.result
+        if exception is not None:
+            raise exception
+        return sampler
+
+    def poll(self, version):
+        """
+        Get the result for a model version if it finished since the
+        last poll, raising the exception of the simulation if it failed
+
+        Parameters:
+        version (int): model version
+
+        Returns:
+            AliasSampler or StabilizerSampler: sampler, or None if there
+            is no new result for the version
+        """
+        with self.condition:
+            if self.result is None or self.result[0] != version:
+                return None
+            if self.delivered_version == version:
+                return None
+            self.delivered_version = version
+            return self.get_result()
+
+    def wait(self, circuit_grid_model, timeout=None):
+        """
+        Get the result for the current circuit of a model, blocking
+        only if it is not ready yet. A failed simulation raises its
+        exception here, and the next submission simulates it again.
+
+        Parameters:
+        circuit_grid_model (CircuitGridModel): model to be simulated
+        timeout (float): maximum time to wait in seconds
+
+        Returns:
+            AliasSampler or StabilizerSampler: sampler, or None on timeout
+        """
+        version = circuit_grid_model.version
+        with self.condition:
+            if self.result is not None and self.result[0] == version:
+                return self.get_result()
+            submitted = self.submitted_version == version
+        if not submitted:
+            self.submit(circuit_grid_model)
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.result is not None and self.result[0] == version,
+                timeout,
+            )
+            if self.result is not None and self.result[0] == version:
+                return self.get_result()
+        return None
@@ -25,6 +25,7 @@ from .scene import Scene
 from .score import Score
 from .sound import Sound
 from .font import Font
+from .presenter import FramePresenter
 
 from .colors import *
 from .gamepad import *
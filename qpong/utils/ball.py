@@ -148,6 +148,22 @@ class Ball(pygame.sprite.Sprite):
         ypos = self.ypos
         return ypos
 
+    def frames_to_measure_right(self):
+        """
+        Predict the number of frames until the ball enters the right
+        measurement zone. Bouncing off the top and bottom edges does
+        not change the horizontal speed.
+
+        Returns:
+            int: number of frames, or None if the ball is moving away
+            from the zone or is already past its start
+        """
+        zone_start = self.right_edge - 12 * self.width_unit
+        xspeed = self.speed * math.sin(math.radians(self.direction))
+        if xspeed <= 0 or self.xpos >= zone_start:
+            return None
+        return math.ceil((zone_start - self.xpos) / xspeed)
+
     # 1 = comp, 2 = player, none = 0
     def action(self):
         """
@@ -18,10 +18,62 @@
 Various fonts used through out the game
 """
 
+from collections import OrderedDict
+
 from qpong.utils.parameters import WIDTH_UNIT
 
 from qpong.utils.resources import load_font
 
+DEFAULT_TEXT_CACHE_SIZE = 64
+
+
+class TextCache:
+    """
+    Bounded cache of rendered text surfaces. When full, the least
+    recently used surface is evicted.
+    """
+
+    def __init__(self, max_size=DEFAULT_TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def render(self, font, text, antialias, color):
+        """
+        Render text with a font, reusing the surface rendered for the
+        same font, text, antialiasing and color before. The surface is
+        shared, so blit it rather than drawing on it.
+
+        Parameters:
+        font (Font): pygame font
+        text (string): text to render
+        antialias (bool): smooth the edges of the characters
+        color (tuple): text color
+
+        Returns:
+            Surface: rendered text
+        """
+        key = (font, text, bool(antialias), tuple(color))
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if self.max_size > 0:
+            self.entries[key] = surface
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return surface
+
+
 # pylint: disable=too-few-public-methods
 class Font:
     """
@@ -29,6 +81,7 @@ class Font:
     """
 
     def __init__(self):
+        self.text_cache = TextCache()
         self.gameover_font = load_font("bit5x3.ttf", 10 * WIDTH_UNIT)
         self.credit_font = load_font("bit5x3.ttf", 2 * WIDTH_UNIT)
         self.replay_font = load_font("bit5x3.ttf", 5 * WIDTH_UNIT)
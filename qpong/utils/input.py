@@ -106,39 +106,27 @@ class Input:
                 if event.button == gamepad.BTN_A:
                     # Place X gate
                     circuit_grid.handle_input_x()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.button == gamepad.BTN_X:
                     # Place Y gate
                     circuit_grid.handle_input_y()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.button == gamepad.BTN_B:
                     # Place Z gate
                     circuit_grid.handle_input_z()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.button == gamepad.BTN_Y:
                     # Place Hadamard gate
                     circuit_grid.handle_input_h()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.button == gamepad.BTN_RIGHT_TRIGGER:
                     # Delete gate
                     circuit_grid.handle_input_delete()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.button == gamepad.BTN_RIGHT_THUMB:
                     # Add or remove a control
                     circuit_grid.handle_input_ctrl()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.button == gamepad.BTN_LEFT_BUMPER:
                     # Update visualizations
                     self.update_paddle(level, screen, scene)
@@ -150,108 +138,82 @@ class Input:
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_X) >= 0.95
                 ):
                     circuit_grid.handle_input_rotate(np.pi / 8)
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 if (
                     event.axis == gamepad.AXIS_RIGHT_THUMB_X
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_X) <= -0.95
                 ):
                     circuit_grid.handle_input_rotate(-np.pi / 8)
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 if (
                     event.axis == gamepad.AXIS_RIGHT_THUMB_Y
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_Y) <= -0.95
                 ):
                     circuit_grid.handle_input_move_ctrl(MOVE_UP)
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 if (
                     event.axis == gamepad.AXIS_RIGHT_THUMB_Y
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_Y) >= 0.95
                 ):
                     circuit_grid.handle_input_move_ctrl(MOVE_DOWN)
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
 
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
                 elif event.key == pygame.K_a:
                     circuit_grid.move_to_adjacent_node(MOVE_LEFT)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
                 elif event.key == pygame.K_d:
                     circuit_grid.move_to_adjacent_node(MOVE_RIGHT)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
                 elif event.key == pygame.K_w:
                     circuit_grid.move_to_adjacent_node(MOVE_UP)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
                 elif event.key == pygame.K_s:
                     circuit_grid.move_to_adjacent_node(MOVE_DOWN)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
                 elif event.key == pygame.K_x:
                     circuit_grid.handle_input_x()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.key == pygame.K_y:
                     circuit_grid.handle_input_y()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.key == pygame.K_z:
                     circuit_grid.handle_input_z()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.key == pygame.K_h:
                     circuit_grid.handle_input_h()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.key == pygame.K_SPACE:
                     circuit_grid.handle_input_delete()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.key == pygame.K_c:
                     # Add or remove a control
                     circuit_grid.handle_input_ctrl()
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.key == pygame.K_UP:
                     # Move a control qubit up
                     circuit_grid.handle_input_move_ctrl(MOVE_UP)
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.key == pygame.K_DOWN:
                     # Move a control qubit down
                     circuit_grid.handle_input_move_ctrl(MOVE_DOWN)
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.key == pygame.K_LEFT:
                     # Rotate a gate
                     circuit_grid.handle_input_rotate(-np.pi / 8)
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
                 elif event.key == pygame.K_RIGHT:
                     # Rotate a gate
                     circuit_grid.handle_input_rotate(np.pi / 8)
-                    circuit_grid.draw(screen)
                     self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                elif event.key == pygame.K_u:
+                    # Undo the last edit
+                    level.edit_history.undo()
+                    circuit_grid.update()
+                    self.update_paddle(level, screen, scene)
+                elif event.key == pygame.K_r:
+                    # Redo the last undone edit
+                    level.edit_history.redo()
+                    circuit_grid.update()
+                    self.update_paddle(level, screen, scene)
                 elif event.key == pygame.K_TAB:
                     # Update visualizations
                     self.update_paddle(level, screen, scene)
@@ -259,26 +221,17 @@ class Input:
     @staticmethod
     def update_paddle(level, screen, scene):
         """
-        Update state vector paddle
+        Request a state vector paddle update. The paddle is redrawn by
+        the main loop once the simulation worker has a result.
         """
-        # Update visualizations
-
-        circuit_grid_model = level.circuit_grid_model
-        right_statevector = level.right_statevector
-        circuit_grid = level.circuit_grid
-        statevector_grid = level.statevector_grid
-
-        circuit = circuit_grid_model.construct_circuit()
-        statevector_grid.paddle_before_measurement(circuit, scene.qubit_num)
-        right_statevector.arrange()
-        circuit_grid.draw(screen)
-        pygame.display.flip()
+        # pylint: disable=unused-argument
+        level.edit_history.end_step()
+        level.simulation_worker.submit(level.circuit_grid_model)
 
     @staticmethod
     def move_update_circuit_grid_display(screen, circuit_grid, direction):
         """
         Update circuit grid after move
         """
+        # pylint: disable=unused-argument
         circuit_grid.move_to_adjacent_node(direction)
-        circuit_grid.draw(screen)
-        pygame.display.flip()
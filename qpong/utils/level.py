@@ -21,11 +21,13 @@ Game level
 import pygame
 
 from qpong.model.circuit_grid_model import CircuitGridModel
+from qpong.model.edit_history import EditHistory
+from qpong.sim.worker import SimulationWorker
 from qpong.containers.vbox import VBox
 from qpong.viz.statevector_grid import StatevectorGrid
 from qpong.controls.circuit_grid import CircuitGrid
 
-from qpong.utils.parameters import WIDTH_UNIT, CIRCUIT_DEPTH
+from qpong.utils.parameters import WIDTH_UNIT, CIRCUIT_DEPTH, MEASURE_LOOKAHEAD
 
 
 class Level:
@@ -38,11 +40,21 @@ class Level:
         self.win = False  # flag for winning the game
         self.left_paddle = pygame.sprite.Sprite()
         self.right_paddle = pygame.sprite.Sprite()
-        self.circuit = None
         self.circuit_grid = None
         self.circuit_grid_model = None
         self.statevector_grid = None
         self.right_statevector = None
+        self.simulation_worker = None
+        self.edit_history = None
+
+    @property
+    def circuit(self):
+        """
+        Qiskit circuit of the level, constructed only when accessed
+        """
+        if self.circuit_grid_model is None:
+            return None
+        return self.circuit_grid_model.get_circuit()
 
     def setup(self, scene, ball):
         """
@@ -50,9 +62,14 @@ class Level:
         """
         scene.qubit_num = self.level
         self.circuit_grid_model = CircuitGridModel(scene.qubit_num, CIRCUIT_DEPTH)
+        self.edit_history = EditHistory(self.circuit_grid_model)
+        if self.simulation_worker is not None:
+            self.simulation_worker.stop()
+        self.simulation_worker = SimulationWorker(scene.qubit_num, CIRCUIT_DEPTH)
 
-        self.circuit = self.circuit_grid_model.construct_circuit()
-        self.statevector_grid = StatevectorGrid(self.circuit, scene.qubit_num)
+        self.statevector_grid = StatevectorGrid(
+            self.circuit_grid_model, scene.qubit_num
+        )
         self.right_statevector = VBox(
             WIDTH_UNIT * 90, WIDTH_UNIT * 0, self.statevector_grid
         )
@@ -78,6 +95,50 @@ class Level:
         self.right_paddle.rect = self.right_paddle.image.get_rect()
         self.right_paddle.rect.x = self.right_statevector.xpos
 
+    def show_simulation_result(self):
+        """
+        Update the right paddle probabilities if the simulation worker
+        finished the current circuit since the last call
+        """
+        sampler = self.simulation_worker.poll(self.circuit_grid_model.version)
+        if sampler is not None:
+            self.statevector_grid.show_probabilities(sampler.probabilities())
+            self.right_statevector.arrange()
+
+    def prepare_measurement(self, ball):
+        """
+        Sample the right paddle measurement ahead of time once the ball
+        is close to the right measurement zone, and again whenever the
+        circuit changes before the ball gets there
+        """
+        frames = ball.frames_to_measure_right()
+        if frames is None or frames > MEASURE_LOOKAHEAD:
+            return
+        version = self.circuit_grid_model.version
+        if self.statevector_grid.is_measurement_prepared(version):
+            return
+        sampler = self.simulation_worker.wait(self.circuit_grid_model, timeout=0)
+        if sampler is not None:
+            self.statevector_grid.prepare_measurement(version, sampler)
+
+    def measure_right_paddle(self, scene):
+        """
+        Measure the right paddle, waiting for the simulation worker only
+        if the measurement was not prepared and the current circuit has
+        not been simulated yet
+
+        Returns:
+            int: measured basis state
+        """
+        sampler = None
+        if not self.statevector_grid.is_measurement_prepared(
+            self.circuit_grid_model.version
+        ):
+            sampler = self.simulation_worker.wait(self.circuit_grid_model)
+        return self.statevector_grid.paddle_after_measurement(
+            self.circuit_grid_model, scene.qubit_num, sampler
+        )
+
     def levelup(self):
         """
         Increase level by 1
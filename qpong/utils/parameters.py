@@ -40,6 +40,9 @@ CIRCUIT_DEPTH = 18
 
 WIN_SCORE = 7
 
+# frames ahead of the right measurement zone to prepare the measurement
+MEASURE_LOOKAHEAD = 30
+
 # For ball.py
 LEFT = 0
 RIGHT = 1
@@ -0,0 +1,148 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Presentation of frames by updating only the screen areas that changed
+"""
+
+import pygame
+
+# share of the screen above which the whole screen is presented
+FULL_UPDATE_RATIO = 0.5
+
+
+class FramePresenter:
+    """
+    Collects the areas of the screen that changed since the last frame
+    and presents them with a single display update per frame. Sprites
+    are compared with how they were drawn on the previous frame, or set
+    a dirty flag when they redraw their image in place, as with
+    pygame.sprite.DirtySprite. Other areas are marked when the value
+    they show changes.
+    """
+
+    def __init__(self, screen, full_update_ratio=FULL_UPDATE_RATIO):
+        self.screen_rect = screen.get_rect()
+        self.full_update_ratio = full_update_ratio
+        self.dirty_rects = []
+        self.full_update = True
+        # sprite -> (rect, image) as drawn on the last frame
+        self.drawn_sprites = {}
+        # key -> (value, rect) of areas shown on the last frame
+        self.drawn_values = {}
+
+        self.frames = 0
+        self.full_updates = 0
+        self.pixels = 0
+        self.last_pixels = 0
+
+    def invalidate(self):
+        """
+        Present the whole screen on the next frame
+        """
+        self.full_update = True
+
+    def add_dirty_rect(self, rect):
+        """
+        Mark an area of the screen to be presented on the next frame
+
+        Parameters:
+        rect (Rect): changed area
+        """
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width > 0 and rect.height > 0:
+            self.dirty_rects.append(rect)
+
+    def draw(self, group, screen):
+        """
+        Draw a sprite group and mark the sprites that moved or changed
+        image since they were last drawn
+
+        Parameters:
+        group (Group): sprites to draw
+        screen (Surface): display surface
+        """
+        group.draw(screen)
+        sprites = set(group.sprites())
+        for sprite in sprites:
+            redrawn = getattr(sprite, "dirty", 0)
+            if redrawn:
+                sprite.dirty = 0
+            drawn = self.drawn_sprites.get(sprite)
+            if drawn is not None:
+                rect, image = drawn
+                if rect == sprite.rect and image is sprite.image and not redrawn:
+                    continue
+                self.add_dirty_rect(rect)
+            self.add_dirty_rect(sprite.rect)
+            self.drawn_sprites[sprite] = (sprite.rect.copy(), sprite.image)
+        for sprite in [
+            sprite for sprite in self.drawn_sprites if sprite.groups() == []
+        ]:
+            # sprites removed from their groups leave their last area
+            self.add_dirty_rect(self.drawn_sprites.pop(sprite)[0])
+
+    def track_value(self, key, value, rect):
+        """
+        Mark an area showing a value when the value changes
+
+        Parameters:
+        key (string): name of the area
+        value: the value shown, compared with the last frame
+        rect (Rect): area the value is drawn in
+        """
+        drawn = self.drawn_values.get(key)
+        if drawn is not None:
+            if drawn[0] == value:
+                return
+            self.add_dirty_rect(drawn[1])
+        self.add_dirty_rect(rect)
+        self.drawn_values[key] = (value, pygame.Rect(rect))
+
+    def present(self):
+        """
+        Show the changed areas of the screen, or the whole screen when
+        most of it changed
+        """
+        screen_pixels = self.screen_rect.width * self.screen_rect.height
+        pixels = sum(rect.width * rect.height for rect in self.dirty_rects)
+        if self.full_update or pixels > self.full_update_ratio * screen_pixels:
+            pygame.display.flip()
+            pixels = screen_pixels
+            self.full_updates += 1
+        elif self.dirty_rects:
+            pygame.display.update(self.dirty_rects)
+        self.full_update = False
+        self.dirty_rects = []
+
+        self.frames += 1
+        self.pixels += pixels
+        self.last_pixels = pixels
+
+    def stats(self):
+        """
+        Get presentation counters
+
+        Returns:
+            dict: frames, full updates, presented pixels and average
+            presented pixels per frame
+        """
+        return {
+            "frames": self.frames,
+            "full_updates": self.full_updates,
+            "pixels": self.pixels,
+            "pixels_per_frame": self.pixels / self.frames if self.frames else 0,
+        }
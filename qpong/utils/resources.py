@@ -21,11 +21,17 @@ Utilities for loading resources (fonts, images and sounds)
 import os
 
 import pygame
+from qpong.log import get_logger
 from qpong.utils.parameters import WIDTH_UNIT
 
+_LOGGER = get_logger("utils")
+
 main_dir = os.path.split(os.path.abspath(__file__))[0]
 data_dir = os.path.join(main_dir, "..", "data")
 
+# decoded and scaled images by (name, colorkey, scale)
+_IMAGE_CACHE = {}
+
 
 def load_image(name, colorkey=None, scale=WIDTH_UNIT / 13):
     """
@@ -41,7 +47,7 @@ def load_image(name, colorkey=None, scale=WIDTH_UNIT / 13):
     try:
         image = pygame.image.load(full_name)
     except pygame.error:
-        print("Cannot load image:", full_name)
+        _LOGGER.error("Cannot load image: %s", full_name)
         error_message = pygame.get_error()
         raise SystemExit(error_message) from pygame.error
     image = image.convert()
@@ -55,6 +61,33 @@ def load_image(name, colorkey=None, scale=WIDTH_UNIT / 13):
     return image, image.get_rect()
 
 
+def load_cached_image(name, colorkey=None, scale=WIDTH_UNIT / 13):
+    """
+    Load image with pygame, decoding and scaling each image only once.
+    The image is shared by all callers, so copy it before drawing on it.
+
+    Parameters:
+    name (string): file name
+    """
+    key = (name, colorkey, scale)
+    image = _IMAGE_CACHE.get(key)
+    if image is None:
+        image = load_image(name, colorkey, scale)[0]
+        _IMAGE_CACHE[key] = image
+    return image, image.get_rect()
+
+
+def preload_images(names, colorkey=None, scale=WIDTH_UNIT / 13):
+    """
+    Decode and scale images ahead of their first use
+
+    Parameters:
+    names (list): file names
+    """
+    for name in names:
+        load_cached_image(name, colorkey, scale)
+
+
 def load_sound(name):
     """
     Load sound with pygame mixer
@@ -69,7 +102,7 @@ def load_sound(name):
     try:
         sound = pygame.mixer.Sound(full_name)
     except pygame.error:
-        print("Cannot load sound: %s" % full_name)
+        _LOGGER.error("Cannot load sound: %s", full_name)
         error_message = pygame.get_error()
         raise SystemExit(error_message) from pygame.error
     return sound
@@ -89,7 +122,7 @@ def load_font(name, size=2 * WIDTH_UNIT):
     try:
         font = pygame.font.Font(full_name, size)
     except pygame.error:
-        print("Cannot load font: %s" % full_name)
+        _LOGGER.error("Cannot load font: %s", full_name)
         error_message = pygame.get_error()
         raise SystemExit(error_message) from pygame.error
     return font
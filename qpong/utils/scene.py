@@ -47,6 +47,9 @@ class Scene:
         self.restart = False
         self.qubit_num = 3
         self.font = Font()
+        # static background of the playing field and what it was made for
+        self.playfield = None
+        self.playfield_key = None
 
     def start(self, screen, ball):
         # pylint: disable=too-many-branches disable=too-many-return-statements
@@ -188,37 +191,85 @@ class Scene:
                 0,
             )
 
-    def score(self, screen, ball):
+    def player_labels(self, screen):
         """
-        Show score for both player
+        Show the names of both players above their scores
         """
-        # Print the score
-        text = self.font.player_font.render("Classical Computer", 1, GRAY)
+        text = self.font.text_cache.render(
+            self.font.player_font, "Classical Computer", 1, GRAY
+        )
         text_pos = text.get_rect(
             center=(round(WINDOW_WIDTH * 0.25) + WIDTH_UNIT * 4.5, WIDTH_UNIT * 1.5)
         )
         screen.blit(text, text_pos)
 
-        text = self.font.player_font.render("Quantum Computer", 1, GRAY)
+        text = self.font.text_cache.render(
+            self.font.player_font, "Quantum Computer", 1, GRAY
+        )
         text_pos = text.get_rect(
             center=(round(WINDOW_WIDTH * 0.75) - WIDTH_UNIT * 4.5, WIDTH_UNIT * 1.5)
         )
         screen.blit(text, text_pos)
 
+    def draw_playfield(self, screen, ball, circuit_grid):
+        """
+        Draw the static background of the playing field: the dashed
+        line, the player labels and the circuit grid frame. They are
+        composed once on a layer that is blitted every frame, and only
+        composed again when the screen or grid size changes or after
+        invalidate_playfield.
+
+        Returns:
+            bool: True if the layer was composed again
+        """
+        key = (
+            screen.get_size(),
+            ball.screenheight,
+            tuple(circuit_grid.circuit_grid_background.rect),
+        )
+        composed = key != self.playfield_key
+        if composed:
+            self.playfield = pygame.Surface(screen.get_size()).convert()
+            self.playfield.fill(BLACK)
+            self.dashed_line(self.playfield, ball)
+            self.player_labels(self.playfield)
+            circuit_grid.draw_background(self.playfield)
+            self.playfield_key = key
+        screen.blit(self.playfield, (0, 0))
+        return composed
+
+    def invalidate_playfield(self):
+        """
+        Compose the playing field background again on the next frame,
+        e.g. after changing colors
+        """
+        self.playfield_key = None
+
+    def score(self, screen, ball):
+        """
+        Show score for both player. The player labels are part of the
+        playing field background.
+
+        Returns:
+            Rect: area the score was drawn in
+        """
         score_print = str(ball.check_score(0))
-        text = self.font.score_font.render(score_print, 1, GRAY)
+        text = self.font.text_cache.render(self.font.score_font, score_print, 1, GRAY)
         text_pos = text.get_rect(
             center=(round(WINDOW_WIDTH * 0.25) + WIDTH_UNIT * 4.5, WIDTH_UNIT * 8)
         )
         screen.blit(text, text_pos)
+        score_rect = text_pos
 
         score_print = str(ball.check_score(1))
-        text = self.font.score_font.render(score_print, 1, GRAY)
+        text = self.font.text_cache.render(self.font.score_font, score_print, 1, GRAY)
         text_pos = text.get_rect(
             center=(round(WINDOW_WIDTH * 0.75) - WIDTH_UNIT * 4.5, WIDTH_UNIT * 8)
         )
         screen.blit(text, text_pos)
 
+        return score_rect.union(text_pos)
+
     def credits(self, screen):
         """
         Show credits screen
@@ -20,8 +20,6 @@ Statevector grid for quantum player
 
 import pygame
 
-from qiskit.quantum_info import Statevector
-
 from qpong.utils.colors import WHITE, BLACK
 from qpong.utils.parameters import WIDTH_UNIT
 from qpong.utils.states import comp_basis_states
@@ -31,73 +29,153 @@ from qpong.utils.font import Font
 
 class StatevectorGrid(pygame.sprite.Sprite):
     """
-    Displays a statevector grid
+    Displays a statevector grid. The surfaces are allocated once: the
+    basis state labels are rendered on a static layer, and updates only
+    redraw the paddle column. The dirty flag is set whenever the image
+    is redrawn in place, for FramePresenter.
     """
 
-    def __init__(self, circuit, qubit_num):
+    def __init__(self, circuit_grid_model, qubit_num):
         pygame.sprite.Sprite.__init__(self)
-        self.image = None
-        self.rect = None
         self.ball = Ball()
         self.font = Font()
         self.block_size = int(round(self.ball.screenheight / 2**qubit_num))
-        self.basis_states = comp_basis_states(circuit.width())
-        self.circuit = circuit
+        self.basis_states = comp_basis_states(circuit_grid_model.max_wires)
+        self.circuit_grid_model = circuit_grid_model
+        # (version, measurement, image) sampled before the measurement zone
+        self.prepared_measurement = None
+        self.dirty = 1
+
+        size = [
+            (circuit_grid_model.max_wires + 1) * 3 * WIDTH_UNIT,
+            self.ball.screenheight,
+        ]
+        self.labels = pygame.Surface(size).convert()
+        # number of qubits the label layer was rendered for
+        self.labels_qubit_num = None
+        self.paddle_column = pygame.Rect(0, 0, WIDTH_UNIT, size[1])
+        self.image = pygame.Surface(size).convert()
+        # off screen image for measurements prepared ahead of time
+        self.measurement_image = pygame.Surface(size).convert()
+        self.rect = self.image.get_rect()
+        self.show_labels(qubit_num)
 
         self.paddle = pygame.Surface([WIDTH_UNIT, self.block_size])
         self.paddle.fill(WHITE)
         self.paddle.convert()
 
-        self.paddle_before_measurement(circuit, qubit_num)
+        self.paddle_before_measurement(circuit_grid_model, qubit_num)
 
     def display_statevector(self, qubit_num):
         """
         Draw computational basis for a statevector of a specified
-        number of qubits
+        number of qubits on the label layer
         """
         for qb_idx in range(2**qubit_num):
-            text = self.font.vector_font.render(
-                "|" + self.basis_states[qb_idx] + ">", 1, WHITE
+            text = self.font.text_cache.render(
+                self.font.vector_font, "|" + self.basis_states[qb_idx] + ">", 1, WHITE
             )
             text_height = text.get_height()
             y_offset = self.block_size * 0.5 - text_height * 0.5
-            self.image.blit(text, (2 * WIDTH_UNIT, qb_idx * self.block_size + y_offset))
+            self.labels.blit(
+                text, (2 * WIDTH_UNIT, qb_idx * self.block_size + y_offset)
+            )
+
+    def show_labels(self, qubit_num):
+        """
+        Render the label layer for a number of qubits, if it was
+        rendered for another number, and show it on both images
+        """
+        if qubit_num == self.labels_qubit_num:
+            return
+        self.labels_qubit_num = qubit_num
+        self.labels.fill(BLACK)
+        self.display_statevector(qubit_num)
+        self.image.blit(self.labels, (0, 0))
+        self.measurement_image.blit(self.labels, (0, 0))
+        self.prepared_measurement = None
+        self.dirty = 1
 
-    def paddle_before_measurement(self, circuit, qubit_num):
+    def paddle_before_measurement(self, circuit_grid_model, qubit_num):
         """
-        Get statevector from circuit, and set the
+        Get statevector from circuit grid model, and set the
         paddle(s) alpha values according to basis
         state(s) probabilitie(s)
         """
+        self.show_labels(qubit_num)
+        self.show_probabilities(circuit_grid_model.get_probabilities())
+
+    def show_probabilities(self, probabilities):
+        """
+        Set the paddle(s) alpha values according to basis
+        state(s) probabilitie(s) computed elsewhere
+        """
         self.update()
-        self.display_statevector(qubit_num)
-        quantum_state = Statevector(circuit)
 
-        for basis_state, ampl in enumerate(quantum_state):
-            self.paddle.set_alpha(int(round(abs(ampl) ** 2 * 255)))
+        for basis_state, probability in enumerate(probabilities):
+            self.paddle.set_alpha(int(round(probability * 255)))
             self.image.blit(self.paddle, (0, basis_state * self.block_size))
 
-    def paddle_after_measurement(self, circuit, qubit_num):
+    def paddle_after_measurement(self, circuit_grid_model, qubit_num, sampler=None):
         """
-        Measure all qubits on circuit
+        Measure all qubits on circuit grid model, using the measurement
+        prepared ahead of time if the circuit has not changed since, or
+        else the sampler from the simulation worker if one is given
         """
-        self.update()
-        self.display_statevector(qubit_num)
-        measurement_bitstring = Statevector(circuit).sample_memory(1)[0]
-        measurement_int = int(measurement_bitstring, 2)
-
-        self.paddle.set_alpha(255)
-        self.image.blit(self.paddle, (0, measurement_int * self.block_size))
+        self.show_labels(qubit_num)
+        prepared = self.prepared_measurement
+        self.prepared_measurement = None
+        if prepared is not None and prepared[0] == circuit_grid_model.version:
+            _, measurement_int, _ = prepared
+            self.image, self.measurement_image = self.measurement_image, self.image
+            self.dirty = 1
+            return measurement_int
+
+        if sampler is None:
+            measurement_int = circuit_grid_model.measure()
+        else:
+            measurement_int = sampler.sample()
+        self.draw_measurement(measurement_int)
 
         return measurement_int
 
-    def update(self):
+    def prepare_measurement(self, version, sampler):
+        """
+        Sample a measurement ahead of time and render the collapsed
+        paddle off screen, leaving the displayed image unchanged
+
+        Parameters:
+        version (int): circuit grid model version that was simulated
+        sampler (AliasSampler or StabilizerSampler): sampler for the version
         """
-        Update statevector grid
+        measurement_int = sampler.sample()
+        self.draw_measurement(measurement_int, self.measurement_image)
+        self.prepared_measurement = (version, measurement_int, self.measurement_image)
+
+    def is_measurement_prepared(self, version):
         """
-        self.image = pygame.Surface(
-            [(self.circuit.width() + 1) * 3 * WIDTH_UNIT, self.ball.screenheight]
+        Check if a measurement was prepared for a model version
+        """
+        return (
+            self.prepared_measurement is not None
+            and self.prepared_measurement[0] == version
         )
-        self.image.convert()
-        self.image.fill(BLACK)
-        self.rect = self.image.get_rect()
+
+    def draw_measurement(self, measurement_int, image=None):
+        """
+        Draw the paddle collapsed to a measured basis state, on the
+        displayed image unless another one is given
+        """
+        if image is None:
+            image = self.image
+            self.dirty = 1
+        image.blit(self.labels, self.paddle_column, self.paddle_column)
+        self.paddle.set_alpha(255)
+        image.blit(self.paddle, (0, measurement_int * self.block_size))
+
+    def update(self):
+        """
+        Clear the paddle column of the displayed image
+        """
+        self.image.blit(self.labels, self.paddle_column, self.paddle_column)
+        self.dirty = 1
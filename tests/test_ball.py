@@ -68,3 +68,21 @@ class TestBall(unittest.TestCase):
         )
         self.assertEqual(self.ball.ypos, 0.7 * WINDOW_HEIGHT / 2)
         self.assertEqual(self.ball.reset_position, LEFT)
+
+    def test_frames_to_measure_right(self):
+        """
+        Test prediction of the frames until the right measurement zone
+        """
+
+        self.ball.direction = 90
+        zone_start = self.ball.right_edge - 12 * self.ball.width_unit
+        frames = self.ball.frames_to_measure_right()
+        for _ in range(frames):
+            self.assertLess(self.ball.xpos, zone_start)
+            self.ball.update()
+
+        self.assertGreaterEqual(self.ball.xpos, zone_start)
+        self.assertIsNone(self.ball.frames_to_measure_right())
+        self.ball.direction = 270
+        self.ball.xpos = self.ball.left_edge + self.ball.width_unit * 15
+        self.assertIsNone(self.ball.frames_to_measure_right())
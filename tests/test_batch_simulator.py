@@ -0,0 +1,78 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test batch simulator
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.sim.batch_simulator import BatchSimulator
+from qpong.sim.statevector_simulator import StatevectorSimulator
+
+from tests.test_statevector_simulator import random_model
+
+
+class TestBatchSimulator(unittest.TestCase):
+    """
+    Unit tests for batch simulator
+    """
+
+    def test_matches_statevector_simulator(self):
+        """
+        Test each row matches simulating the grid on its own
+        """
+
+        models = [random_model(4, 12, seed) for seed in range(40)]
+        simulator = StatevectorSimulator(4)
+        states = BatchSimulator(4).run_models(models)
+
+        self.assertEqual(states.shape, (40, 16))
+        for model, state in zip(models, states):
+            expected = simulator.run_gates(model.get_gates())
+            self.assertTrue(np.allclose(state, expected))
+
+    def test_grids_differing_in_one_cell(self):
+        """
+        Test candidate grids that differ only in one rotation angle
+        """
+
+        gate_lists = []
+        for step in range(16):
+            model = CircuitGridModel(3, 18)
+            model.set_node(0, 0, CircuitGridNode(node_types.H))
+            model.set_node(1, 1, CircuitGridNode(node_types.Y, step * np.pi / 8))
+            model.set_node(2, 2, CircuitGridNode(node_types.X, ctrl_a=1))
+            gate_lists.append(model.get_gates())
+        probabilities = BatchSimulator(3).probabilities(gate_lists)
+        simulator = StatevectorSimulator(3)
+
+        self.assertEqual(probabilities.shape, (16, 8))
+        self.assertTrue(np.allclose(probabilities.sum(axis=1), 1))
+        for gates, row in zip(gate_lists, probabilities):
+            simulator.run_gates(gates)
+            self.assertTrue(np.allclose(row, simulator.probabilities()))
+
+    def test_empty_batch(self):
+        """
+        Test an empty batch gives an empty probability matrix
+        """
+
+        self.assertEqual(BatchSimulator(3).probabilities([]).shape, (0, 8))
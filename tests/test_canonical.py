@@ -0,0 +1,127 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test canonical circuit keys
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.sim.canonical import canonical_key, gate_layers
+
+
+class TestCanonicalKey(unittest.TestCase):
+    """
+    Unit tests for canonical circuit keys
+    """
+
+    @staticmethod
+    def model_with(nodes):
+        """
+        Build a 3x18 model from (wire, column, node) tuples
+        """
+
+        model = CircuitGridModel(3, 18)
+        for wire_num, column_num, node in nodes:
+            model.set_node(wire_num, column_num, node)
+        return model
+
+    def test_commuting_gates_share_key(self):
+        """
+        Test gates on disjoint wires can be reordered and spread out
+        """
+
+        first = self.model_with(
+            [
+                (0, 0, CircuitGridNode(node_types.H)),
+                (1, 1, CircuitGridNode(node_types.X, 0.5)),
+                (2, 2, CircuitGridNode(node_types.X, ctrl_a=0)),
+            ]
+        )
+        second = self.model_with(
+            [
+                (1, 0, CircuitGridNode(node_types.X, 0.5)),
+                (0, 4, CircuitGridNode(node_types.H)),
+                (2, 9, CircuitGridNode(node_types.X, ctrl_a=0)),
+            ]
+        )
+
+        self.assertEqual(first.get_simulation_key(), second.get_simulation_key())
+        self.assertNotEqual(first.get_fingerprint(), second.get_fingerprint())
+        self.assertTrue(np.allclose(first.get_statevector(), second.get_statevector()))
+
+    def test_dependent_gates_keep_order(self):
+        """
+        Test gates sharing a wire are not reordered
+        """
+
+        first = self.model_with(
+            [
+                (0, 0, CircuitGridNode(node_types.H)),
+                (1, 1, CircuitGridNode(node_types.X, ctrl_a=0)),
+            ]
+        )
+        second = self.model_with(
+            [
+                (1, 0, CircuitGridNode(node_types.X, ctrl_a=0)),
+                (0, 1, CircuitGridNode(node_types.H)),
+            ]
+        )
+
+        self.assertNotEqual(first.get_simulation_key(), second.get_simulation_key())
+
+    def test_layers_are_as_early_as_possible(self):
+        """
+        Test each gate goes right after the last gate on its wires
+        """
+
+        gates = [
+            (0, "h", (0,), (), 0.0),
+            (3, "x", (1,), (0,), 0.0),
+            (5, "z", (2,), (), 0.0),
+            (6, "swap", (2, 1), (), 0.0),
+        ]
+
+        self.assertEqual(
+            gate_layers(gates),
+            [[gates[0], gates[2]], [gates[1]], [gates[3]]],
+        )
+        self.assertEqual(
+            canonical_key(3, gates),
+            canonical_key(3, gates[2:3] + gates[:2] + [(9, "swap", (1, 2), (), 0.0)]),
+        )
+
+    def test_equivalent_grid_hits_cache(self):
+        """
+        Test an equivalent grid is served from the result cache
+        """
+
+        model = self.model_with(
+            [
+                (0, 0, CircuitGridNode(node_types.H)),
+                (1, 1, CircuitGridNode(node_types.T)),
+            ]
+        )
+        probabilities = model.get_probabilities()
+        model.set_node(1, 1, CircuitGridNode(node_types.EMPTY))
+        model.set_node(1, 0, CircuitGridNode(node_types.T))
+
+        self.assertIs(model.get_probabilities(), probabilities)
+        self.assertEqual(model.simulation.result_cache.misses, 1)
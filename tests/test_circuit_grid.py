@@ -19,15 +19,24 @@ Test circuit grid
 """
 
 import unittest
+from unittest import mock
 
+import numpy as np
 import pygame
 
 from qpong.model.circuit_grid_model import CircuitGridModel, CircuitGridNode
 from qpong.model import circuit_node_types as node_types
 
 from qpong.controls.circuit_grid import CircuitGrid
+from qpong.utils.ball import Ball
+from qpong.utils.resources import load_cached_image
 
-from qpong.utils.parameters import WINDOW_SIZE, WINDOW_HEIGHT, CIRCUIT_DEPTH
+from qpong.utils.parameters import (
+    WINDOW_SIZE,
+    WINDOW_WIDTH,
+    WINDOW_HEIGHT,
+    CIRCUIT_DEPTH,
+)
 
 from qpong.utils.navigation import MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT
 
@@ -247,6 +256,117 @@ class TestCircuitGrid(unittest.TestCase):
         self.assertEqual(0, node4.ctrl_a)
         self.assertEqual(-1, node4.ctrl_b)
 
+    def test_update_refreshes_changed_tiles(self):
+        """
+        Test only tiles of changed model cells are refreshed
+        """
+
+        updated = []
+        for tiles in self.grid.gate_tiles:
+            for tile in tiles:
+                tile.update = lambda tile=tile: updated.append(
+                    (tile.wire_num, tile.column_num)
+                )
+
+        self.grid.update()
+        self.assertEqual(updated, [])
+        self.circuit_grid_model.set_node(1, 2, CircuitGridNode(node_types.X, ctrl_a=2))
+        self.grid.update()
+        self.assertEqual(sorted(updated), [(1, 2), (2, 2)])
+
+    def test_large_grid_shows_window(self):
+        """
+        Test a grid wider than the window only has tiles for visible nodes
+        """
+
+        model = CircuitGridModel(6, 40)
+        grid = CircuitGrid(0, Ball().screenheight, model)
+        background = grid.circuit_grid_background.rect
+        window = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+
+        self.assertEqual(grid.gate_tiles.shape, (3, CIRCUIT_DEPTH))
+        self.assertLessEqual(background.width, WINDOW_WIDTH)
+        for tiles in grid.gate_tiles:
+            for tile in tiles:
+                self.assertTrue(window.contains(tile.rect))
+
+        model.set_node(5, 30, CircuitGridNode(node_types.H))
+        for _ in range(30):
+            grid.move_to_adjacent_node(MOVE_RIGHT)
+        for _ in range(5):
+            grid.move_to_adjacent_node(MOVE_DOWN)
+
+        self.assertEqual(
+            (grid.first_wire, grid.first_column), (3, 30 - CIRCUIT_DEPTH + 1)
+        )
+        self.assertEqual(grid.get_selected_node_gate_part(), node_types.H)
+        tile = grid.gate_tiles[-1][-1]
+        self.assertEqual((tile.wire_num, tile.column_num), (5, 30))
+        self.assertTrue(background.contains(grid.circuit_grid_cursor.rect))
+        self.assertTrue(window.contains(grid.circuit_grid_cursor.rect))
+        self.assertTrue(window.contains(tile.rect))
+
+        grid.highlight_selected_node(0, 0)
+        self.assertEqual((grid.first_wire, grid.first_column), (0, 0))
+        self.assertEqual(grid.gate_tiles[-1][-1].column_num, CIRCUIT_DEPTH - 1)
+
+    def test_hidden_changes_skip_tiles(self):
+        """
+        Test edits outside the visible window refresh no tiles
+        """
+
+        model = CircuitGridModel(3, 40)
+        grid = CircuitGrid(0, 0, model, visible_columns=10)
+        updated = []
+        for tiles in grid.gate_tiles:
+            for tile in tiles:
+                tile.update = lambda tile=tile: updated.append(tile.column_num)
+
+        model.set_node(0, 25, CircuitGridNode(node_types.X))
+        grid.update()
+        self.assertEqual(updated, [])
+        model.set_node(0, 5, CircuitGridNode(node_types.X))
+        grid.update()
+        self.assertEqual(updated, [5])
+
+    def test_update_uses_preloaded_images(self):
+        """
+        Test tiles are updated without loading or scaling images
+        """
+
+        nodes = [
+            CircuitGridNode(node_types.H),
+            CircuitGridNode(node_types.X, np.pi / 4),
+            CircuitGridNode(node_types.Y, np.pi / 2),
+            CircuitGridNode(node_types.Z, np.pi),
+            CircuitGridNode(node_types.S),
+            CircuitGridNode(node_types.SDG),
+            CircuitGridNode(node_types.T),
+            CircuitGridNode(node_types.TDG),
+            CircuitGridNode(node_types.Y),
+        ]
+        with mock.patch("pygame.image.load") as load, mock.patch(
+            "pygame.transform.scale"
+        ) as scale:
+            for column_num, node in enumerate(nodes):
+                self.circuit_grid_model.set_node(0, column_num, node)
+            self.circuit_grid_model.set_node(
+                2, len(nodes), CircuitGridNode(node_types.X, ctrl_a=1)
+            )
+            self.grid.update()
+
+        load.assert_not_called()
+        scale.assert_not_called()
+        # rotation arcs are drawn on copies of the shared images
+        self.assertIsNot(
+            self.grid.gate_tiles[0][1].image,
+            load_cached_image("gate_images/rx_gate.png", -1)[0],
+        )
+        self.assertIs(
+            self.grid.gate_tiles[0][8].image,
+            load_cached_image("gate_images/y_gate.png", -1)[0],
+        )
+
     def tearDown(self):
         """
         Tear down
@@ -20,6 +20,8 @@ Test circuit grid model
 
 import unittest
 
+import numpy as np
+
 from qpong.model import CircuitGridModel, CircuitGridNode
 from qpong.model import circuit_node_types as node_types
 
@@ -104,3 +106,137 @@ class TestCircuitGridModel(unittest.TestCase):
                     self.model.get_node(wire_num, column_num).node_type,
                     node_types.EMPTY,
                 )
+
+    def test_compiled_instructions(self):
+        """
+        Test the grid compiles to a cached instruction list
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.Y, np.pi / 8))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.model.set_node(0, 1, CircuitGridNode(node_types.TRACE))
+        instructions = self.model.get_instructions()
+
+        self.assertEqual(
+            instructions,
+            ((0, "ry", (0,), (), np.pi / 8), (1, "x", (1,), (0,), 0.0)),
+        )
+        self.assertIs(self.model.get_instructions(), instructions)
+
+    def test_circuit_constructed_lazily(self):
+        """
+        Test the Qiskit circuit is built on demand and rebuilt after edits
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.Y, np.pi / 8))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.assertIsNone(self.model.circuit)
+        circuit = self.model.get_circuit()
+
+        self.assertIs(self.model.get_circuit(), circuit)
+        self.assertEqual(
+            [instruction.operation.name for instruction in circuit.data],
+            ["ry", "cx"],
+        )
+        self.model.set_node(2, 2, self.node_z)
+        self.assertEqual(len(self.model.get_circuit().data), 3)
+
+    def test_nodes_stored_as_records(self):
+        """
+        Test nodes are stored in a structured array and get_node returns
+        a copy that only takes effect through set_node
+        """
+
+        self.model.set_node(1, 2, CircuitGridNode(node_types.X, np.pi, ctrl_a=0))
+        node = self.model.get_node(1, 2)
+        node.radians = 0.0
+
+        self.assertEqual(self.model.nodes.dtype.names[0], "node_type")
+        self.assertEqual(self.model.nodes["radians"][1, 2], np.pi)
+        self.assertEqual(self.model.get_node_gate_part(0, 2), node_types.CTRL)
+        self.model.set_node(1, 2, node)
+        self.assertEqual(self.model.nodes["radians"][1, 2], 0.0)
+        self.assertEqual(self.model.nodes["ctrl_a"][1, 2], 0)
+
+    def test_large_grid(self):
+        """
+        Test a grid with many wires and columns
+        """
+
+        model = CircuitGridModel(64, 500)
+        model.set_node(63, 499, CircuitGridNode(node_types.H))
+        model.set_node(10, 499, CircuitGridNode(node_types.X, ctrl_a=63))
+
+        self.assertEqual(model.get_node_gate_part(63, 499), node_types.H)
+        self.assertEqual(model.get_gate_wire_for_control_node(63, 499), 10)
+        self.assertEqual(len(model.get_instructions()), 2)
+
+    def test_control_and_swap_index(self):
+        """
+        Test the control and swap owner index follows edits
+        """
+
+        rng = np.random.default_rng(7)
+        model = CircuitGridModel(5, 6)
+        for _ in range(300):
+            wire_num, column_num = rng.integers(5), rng.integers(6)
+            others = [wire for wire in range(5) if wire != wire_num]
+            choice = rng.integers(4)
+            if choice == 0:
+                node = CircuitGridNode(node_types.EMPTY)
+            elif choice == 1:
+                node = CircuitGridNode(node_types.SWAP, swap=rng.choice(others))
+            else:
+                ctrl_a, ctrl_b = rng.choice(others, 2, replace=False)
+                node = CircuitGridNode(
+                    node_types.X, ctrl_a=ctrl_a, ctrl_b=ctrl_b if choice == 3 else -1
+                )
+            model.set_node(wire_num, column_num, node)
+
+            for wire in range(5):
+                column = [model.get_node(other, column_num) for other in range(5)]
+                owners = [
+                    other
+                    for other, other_node in enumerate(column)
+                    if wire in (other_node.ctrl_a, other_node.ctrl_b)
+                ]
+                swaps = [
+                    other
+                    for other, other_node in enumerate(column)
+                    if other_node.swap == wire
+                ]
+                expected = node_types.EMPTY
+                if column[wire].node_type != node_types.EMPTY:
+                    expected = column[wire].node_type
+                elif owners:
+                    expected = node_types.CTRL
+                elif swaps:
+                    expected = node_types.SWAP
+                self.assertEqual(
+                    model.get_gate_wire_for_control_node(wire, column_num),
+                    owners[-1] if owners else -1,
+                )
+                self.assertEqual(model.get_node_gate_part(wire, column_num), expected)
+
+        model.reset_circuit()
+        self.assertTrue(np.all(model.control_owners == -1))
+        self.assertTrue(np.all(model.swap_owners == -1))
+
+    def test_change_events(self):
+        """
+        Test listeners receive the cells changed by each edit
+        """
+
+        changes = []
+        self.model.add_listener(changes.append)
+        self.model.set_node(1, 2, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.model.set_node(1, 2, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.model.set_node(1, 2, CircuitGridNode(node_types.X))
+
+        self.assertEqual(self.model.version, 2)
+        self.assertEqual([change.version for change in changes], [1, 2])
+        self.assertEqual(changes[0].cells, {(1, 2), (0, 2)})
+        self.assertEqual(changes[1].columns, [2])
+        self.model.remove_listener(changes.append)
+        self.model.reset_circuit()
+        self.assertEqual(len(changes), 2)
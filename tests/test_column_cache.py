@@ -0,0 +1,99 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test column prefix cache
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.sim.statevector_simulator import StatevectorSimulator
+
+
+class TestColumnPrefixCache(unittest.TestCase):
+    """
+    Unit tests for column prefix cache
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.model = CircuitGridModel(3, 18)
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.cache = self.model.simulation.column_cache
+
+    def test_first_run_simulates_columns_with_gates(self):
+        """
+        Test first simulation is a miss over every column that has gates
+        """
+
+        self.model.get_statevector()
+
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 0)
+        self.assertEqual(self.cache.last_columns_simulated, 2)
+
+    def test_edit_resimulates_from_edited_column(self):
+        """
+        Test an edit only re-simulates from its column onward
+        """
+
+        self.model.get_statevector()
+        self.model.set_node(2, 15, CircuitGridNode(node_types.Y))
+        statevector = self.model.get_statevector()
+
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.last_columns_simulated, 1)
+        self.assertEqual(self.cache.columns_simulated, 3)
+
+        self.model.set_node(2, 10, CircuitGridNode(node_types.T))
+        statevector = self.model.get_statevector()
+
+        self.assertEqual(self.cache.hits, 2)
+        self.assertEqual(self.cache.last_columns_simulated, 2)
+
+        expected = StatevectorSimulator(3).run(self.model.nodes)
+        np.testing.assert_allclose(statevector, expected)
+
+    def test_unchanged_circuit_simulates_nothing(self):
+        """
+        Test repeated simulation without edits is served from cache
+        """
+
+        self.cache.run(self.model.get_gates())
+        self.cache.run(self.model.get_gates())
+
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["last_columns_simulated"], 0)
+
+    def test_reset_circuit_invalidates_cache(self):
+        """
+        Test resetting the circuit discards all cached columns
+        """
+
+        self.model.get_statevector()
+        self.model.reset_circuit()
+        statevector = self.model.get_statevector()
+
+        self.assertEqual(self.cache.misses, 2)
+        self.assertAlmostEqual(statevector[0], 1)
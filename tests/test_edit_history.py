@@ -0,0 +1,133 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test edit history
+"""
+
+import unittest
+
+from qpong.model import CircuitGridModel, CircuitGridNode, EditHistory
+from qpong.model import circuit_node_types as node_types
+
+
+class TestEditHistory(unittest.TestCase):
+    """
+    Unit tests for edit history
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.model = CircuitGridModel(3, 18)
+        self.history = EditHistory(self.model, max_steps=3)
+
+    def test_undo_redo_step(self):
+        """
+        Test a step of several edits is undone and redone together
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.history.end_step()
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X, ctrl_a=2))
+        self.model.set_node(1, 0, CircuitGridNode(node_types.TRACE))
+        self.history.end_step()
+        key = self.model.get_fingerprint()
+
+        self.assertTrue(self.history.undo())
+        self.assertEqual(self.model.get_node(0, 0).ctrl_a, -1)
+        self.assertEqual(self.model.get_node(1, 0).node_type, node_types.EMPTY)
+        self.assertEqual(self.model.get_node_gate_part(2, 0), node_types.EMPTY)
+        self.assertTrue(self.history.redo())
+        self.assertEqual(self.model.get_fingerprint(), key)
+        self.assertEqual(self.model.get_node_gate_part(2, 0), node_types.CTRL)
+        self.assertFalse(self.history.redo())
+
+    def test_steps_store_only_changed_cells(self):
+        """
+        Test steps hold one diff per written node
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.history.end_step()
+        self.history.end_step()
+
+        self.assertEqual(len(self.history.undo_steps), 1)
+        self.assertEqual(len(self.history.undo_steps[0]), 1)
+
+    def test_new_edit_clears_redo(self):
+        """
+        Test editing after undo discards the undone steps
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.history.undo()
+        self.model.set_node(1, 1, CircuitGridNode(node_types.Z))
+
+        self.assertFalse(self.history.can_redo())
+        self.assertFalse(self.history.redo())
+        self.assertEqual(self.model.get_node(0, 0).node_type, node_types.EMPTY)
+
+    def test_bounded_history(self):
+        """
+        Test the oldest steps are dropped when the buffer is full
+        """
+
+        for column_num in range(5):
+            self.model.set_node(0, column_num, CircuitGridNode(node_types.X))
+            self.history.end_step()
+
+        while self.history.undo():
+            pass
+
+        self.assertEqual(self.model.get_node(0, 1).node_type, node_types.X)
+        self.assertEqual(self.model.get_node(0, 2).node_type, node_types.EMPTY)
+
+    def test_undo_reset(self):
+        """
+        Test undoing a circuit reset restores the gates
+        """
+
+        self.model.set_node(0, 3, CircuitGridNode(node_types.Y, 0.5))
+        self.model.set_node(2, 4, CircuitGridNode(node_types.SWAP, swap=1))
+        self.history.end_step()
+        self.model.reset_circuit()
+        self.history.undo()
+
+        self.assertEqual(self.model.get_node(0, 3).radians, 0.5)
+        self.assertEqual(self.model.get_node_gate_part(1, 4), node_types.SWAP)
+
+    def test_clear_forgets_previous_game(self):
+        """
+        Test clearing after a reset for a new game leaves nothing to undo
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.history.end_step()
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X))
+        self.history.end_step()
+        self.history.undo()
+        self.model.reset_circuit()
+        self.history.clear()
+        self.history.end_step()
+
+        self.assertFalse(self.history.can_undo())
+        self.assertFalse(self.history.can_redo())
+        self.assertFalse(self.history.undo())
+        self.assertEqual(self.model.get_node_gate_part(0, 0), node_types.EMPTY)
@@ -0,0 +1,75 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test fonts and the text surface cache
+"""
+
+import unittest
+
+import pygame
+
+from qpong.utils.colors import WHITE, GRAY
+from qpong.utils.font import Font, TextCache
+
+
+class TestTextCache(unittest.TestCase):
+    """
+    Unit tests for the text surface cache
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        pygame.init()
+        self.font = Font().vector_font
+
+    def test_render_reuses_surface(self):
+        """
+        Test rendering the same text again returns the cached surface
+        """
+
+        cache = TextCache()
+        surface = cache.render(self.font, "|01>", 1, WHITE)
+
+        self.assertIs(cache.render(self.font, "|01>", True, WHITE), surface)
+        self.assertIsNot(cache.render(self.font, "|01>", 1, GRAY), surface)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_least_recently_used_eviction(self):
+        """
+        Test the least recently used surface is evicted when full
+        """
+
+        cache = TextCache(2)
+        surface = cache.render(self.font, "a", 1, WHITE)
+        cache.render(self.font, "b", 1, WHITE)
+        cache.render(self.font, "a", 1, WHITE)
+        cache.render(self.font, "c", 1, WHITE)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.render(self.font, "a", 1, WHITE), surface)
+        cache.render(self.font, "b", 1, WHITE)
+        self.assertEqual(cache.misses, 4)
+
+    def tearDown(self):
+        """
+        Tear down
+        """
+
+        pygame.quit()
@@ -0,0 +1,81 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test gate matrices
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.sim.batch_simulator import gate_matrices
+from qpong.sim.gates import ROTATION_MATRICES, gate_matrix, rotation_matrix
+
+
+class TestGateMatrices(unittest.TestCase):
+    """
+    Unit tests for gate matrices
+    """
+
+    def test_quantized_rotations_are_precomputed(self):
+        """
+        Test rotations by multiples of pi / 8 reuse precomputed matrices
+        """
+
+        for gate_name in ("rx", "ry", "rz"):
+            for step in range(-16, 48):
+                radians = step * np.pi / 8
+                matrix = gate_matrix(gate_name, radians)
+
+                self.assertFalse(matrix.flags.writeable)
+                self.assertIs(matrix.base, ROTATION_MATRICES[gate_name])
+                self.assertTrue(
+                    np.allclose(matrix, rotation_matrix(gate_name, radians))
+                )
+
+    def test_accumulated_rotation_is_quantized(self):
+        """
+        Test an angle reached by repeated pi / 8 steps is still looked up
+        """
+
+        radians = 0.0
+        for _ in range(11):
+            radians = (radians + np.pi / 8) % (2 * np.pi)
+
+        self.assertIs(gate_matrix("ry", radians).base, ROTATION_MATRICES["ry"])
+
+    def test_arbitrary_rotation_is_computed(self):
+        """
+        Test angles off the pi / 8 grid fall back to computing the matrix
+        """
+
+        matrix = gate_matrix("rx", 0.3)
+
+        self.assertTrue(matrix.flags.writeable)
+        self.assertTrue(np.allclose(matrix, rotation_matrix("rx", 0.3)))
+
+    def test_batch_matrices(self):
+        """
+        Test batched matrices for quantized and arbitrary angles
+        """
+
+        for radians in (np.arange(8) * np.pi / 8, np.array([0.3, np.pi / 8])):
+            for gate_name in ("rx", "ry", "rz"):
+                expected = [rotation_matrix(gate_name, angle) for angle in radians]
+                self.assertTrue(
+                    np.allclose(gate_matrices(gate_name, radians), expected)
+                )
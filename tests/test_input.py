@@ -283,6 +283,30 @@ class TestLevel(unittest.TestCase):
         self.assertEqual(2, node4.ctrl_a)
         self.assertEqual(-1, node4.ctrl_b)
 
+    def test_handle_undo_redo_keyboard_presses(self):
+        """
+        Test undoing and redoing gate placements
+        """
+
+        self.inject_event(pygame.KEYDOWN, key=pygame.K_x)
+        self.inject_event(pygame.KEYDOWN, key=pygame.K_c)
+        self.inject_event(pygame.KEYDOWN, key=pygame.K_d)
+        self.inject_event(pygame.KEYDOWN, key=pygame.K_h)
+        model = self.level.circuit_grid_model
+
+        self.inject_event(pygame.KEYDOWN, key=pygame.K_u)
+        self.assertEqual(model.get_node_gate_part(0, 1), node_types.EMPTY)
+        self.assertEqual(model.get_node(0, 0).ctrl_a, 1)
+
+        self.inject_event(pygame.KEYDOWN, key=pygame.K_u)
+        self.assertEqual(model.get_node(0, 0).ctrl_a, -1)
+        self.assertEqual(model.get_node_gate_part(1, 0), node_types.EMPTY)
+
+        self.inject_event(pygame.KEYDOWN, key=pygame.K_r)
+        self.inject_event(pygame.KEYDOWN, key=pygame.K_r)
+        self.assertEqual(model.get_node(0, 0).ctrl_a, 1)
+        self.assertEqual(model.get_node_gate_part(0, 1), node_types.H)
+
     def tearDown(self):
         """
         Tear down
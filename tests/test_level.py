@@ -22,6 +22,8 @@ import unittest
 
 import pygame
 
+from qpong.model import CircuitGridNode
+from qpong.model import circuit_node_types as node_types
 from qpong.utils.level import Level
 from qpong.utils.scene import Scene
 from qpong.utils.ball import Ball
@@ -75,6 +77,23 @@ class Testlevel(unittest.TestCase):
         self.assertEqual(self.level.statevector_grid is None, False)
         self.assertEqual(self.level.right_statevector is None, False)
 
+    def test_prepare_measurement(self):
+        """
+        Test the right paddle measurement is prepared ahead of the zone
+        """
+
+        self.level.setup(self.scene, self.ball)
+        self.level.circuit_grid_model.set_node(1, 0, CircuitGridNode(node_types.X))
+        self.ball.direction = 90
+        self.ball.xpos = self.ball.right_edge - 14 * self.ball.width_unit
+        self.level.simulation_worker.wait(self.level.circuit_grid_model, timeout=5)
+        self.level.prepare_measurement(self.ball)
+        version = self.level.circuit_grid_model.version
+
+        self.assertTrue(self.level.statevector_grid.is_measurement_prepared(version))
+        self.assertEqual(self.level.measure_right_paddle(self.scene), 2)
+        self.level.simulation_worker.stop()
+
     def tearDown(self):
         """
         Tear down
@@ -0,0 +1,97 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test logging configuration
+"""
+
+import io
+import logging
+import unittest
+from unittest import mock
+
+from qpong.log import configure_logging, get_logger, set_level
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+
+
+class TestLog(unittest.TestCase):
+    """
+    Unit tests for logging configuration
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.stream = io.StringIO()
+
+    def tearDown(self):
+        """
+        Tear down
+        """
+
+        configure_logging("", io.StringIO())
+
+    def test_disabled_by_default(self):
+        """
+        Test debug messages are not formatted at the default level
+        """
+
+        configure_logging("", self.stream)
+        model = CircuitGridModel(3, 18)
+        model.set_node(0, 0, CircuitGridNode(node_types.X, ctrl_a=1))
+
+        with mock.patch.object(model, "get_node_gate_part") as get_node_gate_part:
+            self.assertEqual(model.get_gate_wire_for_control_node(1, 0), 0)
+        get_node_gate_part.assert_not_called()
+        self.assertEqual(self.stream.getvalue(), "")
+
+    def test_subsystem_switch(self):
+        """
+        Test levels can be set per subsystem
+        """
+
+        configure_logging("error,model=debug", self.stream)
+        model = CircuitGridModel(3, 18)
+        model.set_node(0, 0, CircuitGridNode(node_types.X, ctrl_a=1))
+        model.get_gate_wire_for_control_node(1, 0)
+        get_logger("controls").warning("hidden")
+
+        self.assertIn("qpong.model: Found gate 1 on wire 0", self.stream.getvalue())
+        self.assertNotIn("hidden", self.stream.getvalue())
+
+    def test_set_level(self):
+        """
+        Test levels can be changed after configuration
+        """
+
+        configure_logging("", self.stream)
+        set_level("debug", "viz")
+
+        self.assertTrue(get_logger("viz").isEnabledFor(logging.DEBUG))
+        self.assertFalse(get_logger("sim").isEnabledFor(logging.DEBUG))
+
+    def test_rejects_unknown_names(self):
+        """
+        Test unknown subsystems and levels are rejected
+        """
+
+        with self.assertRaises(ValueError):
+            get_logger("network")
+        with self.assertRaises(ValueError):
+            configure_logging("model=loud", self.stream)
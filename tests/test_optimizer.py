@@ -0,0 +1,132 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test peephole optimizer
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.sim.optimizer import optimize_gates
+from qpong.sim.statevector_simulator import StatevectorSimulator
+
+
+class TestOptimizer(unittest.TestCase):
+    """
+    Unit tests for peephole optimizer
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.model = CircuitGridModel(3, 18)
+
+    def assert_equivalent(self):
+        """
+        Assert the optimized gates give the same statevector
+        """
+
+        expected = StatevectorSimulator(3).run(self.model.nodes)
+        np.testing.assert_allclose(self.model.get_statevector(), expected, atol=1e-9)
+
+    def test_cancel_adjacent_pairs(self):
+        """
+        Test self-inverse and inverse pairs cancel, including nested pairs
+        """
+
+        # 0 H-X-X-H-S-Sdg
+        # 1 --Y-----Y----
+        for column_num, node_type in enumerate(
+            (node_types.H, node_types.X, node_types.X, node_types.H)
+        ):
+            self.model.set_node(0, column_num, CircuitGridNode(node_type))
+        self.model.set_node(0, 4, CircuitGridNode(node_types.S))
+        self.model.set_node(0, 5, CircuitGridNode(node_types.SDG))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.Y))
+        self.model.set_node(1, 4, CircuitGridNode(node_types.Y))
+
+        self.assertEqual(self.model.get_gates(), [])
+        self.assertEqual(self.model.get_optimization_stats()["eliminated"], 8)
+        self.assert_equivalent()
+
+    def test_gate_in_between_blocks_cancellation(self):
+        """
+        Test gates touching the wire in between, including controls,
+        prevent cancellation
+        """
+
+        # 0 H-|-H
+        # 1 --X--
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.model.set_node(0, 2, CircuitGridNode(node_types.H))
+
+        self.assertEqual(len(self.model.get_gates()), 3)
+        self.assert_equivalent()
+
+    def test_controlled_pairs_cancel(self):
+        """
+        Test identical controlled gates cancel
+        """
+
+        self.model.set_node(1, 3, CircuitGridNode(node_types.Z, ctrl_a=0))
+        self.model.set_node(1, 7, CircuitGridNode(node_types.Z, ctrl_a=0))
+        self.model.set_node(2, 5, CircuitGridNode(node_types.H))
+
+        self.assertEqual(len(self.model.get_gates()), 1)
+        self.assert_equivalent()
+
+    def test_merge_rotations(self):
+        """
+        Test chains of rotations about the same axis merge into one
+        """
+
+        for column_num in range(4):
+            self.model.set_node(
+                0, column_num, CircuitGridNode(node_types.Y, radians=np.pi / 8)
+            )
+
+        gates = self.model.get_gates()
+
+        self.assertEqual(len(gates), 1)
+        self.assertEqual(gates[0][1], "ry")
+        self.assertAlmostEqual(gates[0][4], np.pi / 2)
+        self.assert_equivalent()
+
+    def test_empty_columns_skipped(self):
+        """
+        Test the effective depth only counts columns with gates
+        """
+
+        self.model.set_node(0, 2, CircuitGridNode(node_types.T))
+        self.model.set_node(1, 9, CircuitGridNode(node_types.H))
+
+        self.assertEqual(self.model.get_optimization_stats()["depth"], 2)
+
+    def test_swap_pairs_cancel(self):
+        """
+        Test swaps of the same wires cancel in either orientation
+        """
+
+        gates = [(0, "swap", (0, 2), (), 0.0), (1, "swap", (2, 0), (), 0.0)]
+
+        self.assertEqual(optimize_gates(gates), [])
@@ -0,0 +1,146 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test frame presenter
+"""
+
+import unittest
+from unittest import mock
+
+import pygame
+
+from qpong.utils.presenter import FramePresenter
+from qpong.utils.parameters import WINDOW_SIZE
+
+
+class TestFramePresenter(unittest.TestCase):
+    """
+    Unit tests for frame presenter
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        pygame.init()
+
+        flags = pygame.DOUBLEBUF | pygame.HWSURFACE
+        self.screen = pygame.display.set_mode(WINDOW_SIZE, flags)
+        self.presenter = FramePresenter(self.screen)
+
+        self.sprite = pygame.sprite.Sprite()
+        self.sprite.image = pygame.Surface([10, 10])
+        self.sprite.rect = self.sprite.image.get_rect(topleft=(100, 100))
+        self.group = pygame.sprite.Group(self.sprite)
+
+    def present(self):
+        """
+        Present a frame, returning the rectangles passed to the display
+        or None for a full flip
+        """
+
+        with mock.patch("pygame.display.update") as update, mock.patch(
+            "pygame.display.flip"
+        ) as flip:
+            self.presenter.present()
+        if flip.called:
+            return None
+        if not update.called:
+            return []
+        return update.call_args[0][0]
+
+    def test_first_frame_is_full(self):
+        """
+        Test the first frame and invalidated frames are flipped
+        """
+
+        self.presenter.draw(self.group, self.screen)
+        self.assertIsNone(self.present())
+        self.assertEqual(self.present(), [])
+        self.presenter.invalidate()
+        self.assertIsNone(self.present())
+        self.assertEqual(self.presenter.stats()["full_updates"], 2)
+
+    def test_moved_sprite_updates_old_and_new_area(self):
+        """
+        Test a moved sprite presents the area it left and entered
+        """
+
+        self.presenter.draw(self.group, self.screen)
+        self.present()
+        self.presenter.draw(self.group, self.screen)
+        self.assertEqual(self.present(), [])
+
+        self.sprite.rect.move_ip(5, 0)
+        self.presenter.draw(self.group, self.screen)
+
+        self.assertEqual(
+            self.present(),
+            [pygame.Rect(100, 100, 10, 10), pygame.Rect(105, 100, 10, 10)],
+        )
+        self.assertEqual(self.presenter.last_pixels, 200)
+
+    def test_changed_image_and_value(self):
+        """
+        Test a new sprite image and a changed value are presented
+        """
+
+        self.presenter.draw(self.group, self.screen)
+        self.presenter.track_value("score", (0, 0), (0, 0, 40, 20))
+        self.present()
+
+        self.sprite.image = pygame.Surface([10, 10])
+        self.presenter.draw(self.group, self.screen)
+        self.presenter.track_value("score", (0, 0), (0, 0, 40, 20))
+        self.assertEqual(len(self.present()), 2)
+
+        self.presenter.track_value("score", (1, 0), (0, 0, 40, 20))
+        self.assertEqual(len(self.present()), 2)
+
+    def test_dirty_sprite_redrawn_in_place(self):
+        """
+        Test a sprite that redrew its image in place is presented once
+        """
+
+        self.presenter.draw(self.group, self.screen)
+        self.present()
+        self.sprite.dirty = 1
+        self.presenter.draw(self.group, self.screen)
+
+        self.assertEqual(len(self.present()), 2)
+        self.assertEqual(self.sprite.dirty, 0)
+        self.presenter.draw(self.group, self.screen)
+        self.assertEqual(self.present(), [])
+
+    def test_large_change_flips(self):
+        """
+        Test the whole screen is flipped when most of it changed
+        """
+
+        self.present()
+        self.presenter.add_dirty_rect(self.screen.get_rect().inflate(-10, -10))
+
+        self.assertIsNone(self.present())
+        self.assertEqual(self.presenter.last_pixels, WINDOW_SIZE[0] * WINDOW_SIZE[1])
+
+    def tearDown(self):
+        """
+        Tear down
+        """
+
+        pygame.quit()
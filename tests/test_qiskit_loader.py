@@ -0,0 +1,74 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test deferred Qiskit import
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+
+class TestQiskitLoader(unittest.TestCase):
+    """
+    Unit tests for deferred Qiskit import
+    """
+
+    def test_import_qpong_defers_qiskit(self):
+        """
+        Test importing the game package does not import Qiskit
+        """
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run(
+            [sys.executable, "-c", "import sys, qpong; print('qiskit' in sys.modules)"],
+            cwd=root,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+
+        self.assertEqual(output.splitlines()[-1], "False")
+
+    def test_start_screen_defers_qiskit(self):
+        """
+        Test showing the start screen does not import Qiskit
+        """
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = (
+            "import sys, pygame\n"
+            "from qpong.utils.ball import Ball\n"
+            "from qpong.utils.scene import Scene\n"
+            "pygame.init()\n"
+            "screen = pygame.display.set_mode((1200, 750))\n"
+            "pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))\n"
+            "Scene().start(screen, Ball())\n"
+            "print('qiskit' in sys.modules)\n"
+        )
+        environment = dict(os.environ, SDL_VIDEODRIVER="dummy")
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=root,
+            env=environment,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+
+        self.assertEqual(output.splitlines()[-1], "False")
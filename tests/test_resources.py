@@ -22,7 +22,12 @@ import unittest
 
 import pygame
 
-from qpong.utils.resources import load_font, load_sound, load_image
+from qpong.utils.resources import (
+    load_font,
+    load_sound,
+    load_image,
+    load_cached_image,
+)
 
 from qpong.utils.parameters import WINDOW_SIZE
 
@@ -75,6 +80,18 @@ class TestResources(unittest.TestCase):
         self.assertEqual(self.image1 is not None, True)
         self.assertEqual(self.image2 is not None, True)
 
+    def test_load_cached_image(self):
+        """
+        Test cached images are decoded once and shared
+        """
+
+        image, rect = load_cached_image("gate_images/h_gate.png", -1)
+        cached_image, cached_rect = load_cached_image("gate_images/h_gate.png", -1)
+
+        self.assertIs(cached_image, image)
+        self.assertEqual(cached_rect, rect)
+        self.assertIsNot(cached_rect, rect)
+
     def tearDown(self):
         """
         Tear down
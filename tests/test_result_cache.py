@@ -0,0 +1,122 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test simulation result cache
+"""
+
+import unittest
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.sim.result_cache import SimulationCache, circuit_fingerprint
+from qpong.sim.simulation import STABILIZER_BACKEND
+
+
+class TestSimulationCache(unittest.TestCase):
+    """
+    Unit tests for simulation result cache
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.model = CircuitGridModel(3, 18)
+
+    def test_fingerprint_ignores_non_gate_nodes(self):
+        """
+        Test TRACE nodes do not change the circuit fingerprint
+        """
+
+        self.model.set_node(0, 2, CircuitGridNode(node_types.X, ctrl_a=2))
+        key = circuit_fingerprint(self.model.nodes)
+        self.model.set_node(1, 2, CircuitGridNode(node_types.TRACE))
+
+        self.assertEqual(circuit_fingerprint(self.model.nodes), key)
+        self.assertNotEqual(
+            circuit_fingerprint(CircuitGridModel(3, 18).nodes),
+            key,
+        )
+
+    def test_toggled_gate_hits_cache(self):
+        """
+        Test toggling a gate off and on again is served from cache
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.T))
+        self.model.get_probabilities()
+        self.model.set_node(0, 5, CircuitGridNode(node_types.H))
+        probabilities = self.model.get_probabilities()
+        self.model.set_node(0, 5, CircuitGridNode(node_types.EMPTY))
+        self.model.get_probabilities()
+        self.model.set_node(0, 5, CircuitGridNode(node_types.H))
+
+        self.assertIs(self.model.get_probabilities(), probabilities)
+        self.assertEqual(self.model.simulation.result_cache.hits, 2)
+        self.assertEqual(self.model.simulation.result_cache.misses, 2)
+
+    def test_toggled_clifford_gate_hits_cache(self):
+        """
+        Test toggling a gate on a Clifford-only grid reuses the
+        stabilizer sampler and its probabilities
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.model.get_probabilities()
+        self.model.set_node(0, 5, CircuitGridNode(node_types.H))
+        sampler = self.model.get_sampler()
+        probabilities = self.model.get_probabilities()
+        for _ in range(5):
+            self.model.set_node(0, 5, CircuitGridNode(node_types.EMPTY))
+            self.model.get_probabilities()
+            self.model.set_node(0, 5, CircuitGridNode(node_types.H))
+            self.model.get_probabilities()
+
+        self.assertEqual(self.model.get_backend(), STABILIZER_BACKEND)
+        self.assertIs(self.model.get_sampler(), sampler)
+        self.assertIs(self.model.get_probabilities(), probabilities)
+        self.assertEqual(
+            self.model.simulation.result_cache.stats(),
+            {"size": 2, "hits": 10, "misses": 2, "evictions": 0},
+        )
+
+    def test_cached_results_are_read_only(self):
+        """
+        Test cached arrays cannot be modified by callers
+        """
+
+        statevector, probabilities = self.model.simulate()
+
+        self.assertFalse(statevector.flags.writeable)
+        self.assertFalse(probabilities.flags.writeable)
+
+    def test_least_recently_used_eviction(self):
+        """
+        Test the least recently used entry is evicted when full
+        """
+
+        cache = SimulationCache(2)
+        for key in ("a", "b"):
+            cache.add(key)
+        cache.get("a")
+        cache.add("c")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(len(cache), 2)
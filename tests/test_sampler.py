@@ -0,0 +1,71 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test alias sampler
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.sim.sampler import AliasSampler
+
+
+class TestAliasSampler(unittest.TestCase):
+    """
+    Unit tests for alias sampler
+    """
+
+    def test_sample_distribution(self):
+        """
+        Test sample frequencies follow the probabilities
+        """
+
+        probabilities = np.array([0.5, 0.0, 0.125, 0.375])
+        sampler = AliasSampler(probabilities, np.random.default_rng(1))
+
+        counts = np.bincount(sampler.sample_batch(100000), minlength=4)
+
+        self.assertEqual(counts[1], 0)
+        np.testing.assert_allclose(counts / 100000, probabilities, atol=0.01)
+
+    def test_sample_returns_int(self):
+        """
+        Test a single draw is a plain integer
+        """
+
+        sampler = AliasSampler(np.array([0.0, 0.0, 1.0, 0.0]))
+
+        for _ in range(20):
+            measurement = sampler.sample()
+            self.assertIsInstance(measurement, int)
+            self.assertEqual(measurement, 2)
+
+    def test_model_rebuilds_sampler_on_change(self):
+        """
+        Test the model measures the current circuit after an edit
+        """
+
+        model = CircuitGridModel(3, 4)
+        self.assertEqual(model.measure(), 0)
+
+        model.set_node(1, 2, CircuitGridNode(node_types.X))
+
+        self.assertEqual(model.measure(), 0b010)
+        self.assertTrue(np.all(model.measure_batch(10) == 0b010))
@@ -19,12 +19,15 @@ Test scene
 """
 
 import unittest
+from unittest import mock
 
 import pygame
 
 from qpong.utils.scene import Scene
 from qpong.utils.level import Level
 from qpong.utils.ball import Ball
+from qpong.model import CircuitGridModel
+from qpong.controls.circuit_grid import CircuitGrid
 
 from qpong.utils.parameters import (
     WINDOW_SIZE,
@@ -92,6 +95,47 @@ class TestScene(unittest.TestCase):
         self.scene.start(self.screen, self.ball)
         self.assertEqual(self.ball.initial_speed_factor, EXPERT)
 
+    def test_score_rendered_on_change(self):
+        """
+        Test score text is only rendered when the score changes
+        """
+
+        text_cache = self.scene.font.text_cache
+        area = self.scene.score(self.screen, self.ball)
+        misses = text_cache.misses
+        self.assertEqual(self.scene.score(self.screen, self.ball), area)
+        self.assertEqual(text_cache.misses, misses)
+
+        self.ball.score.update(0)
+        self.scene.score(self.screen, self.ball)
+        self.assertEqual(text_cache.misses, misses + 1)
+
+    def test_playfield_composed_once(self):
+        """
+        Test the playing field background is composed once and blitted
+        on later frames until invalidated
+        """
+
+        circuit_grid = CircuitGrid(0, self.ball.screenheight, CircuitGridModel(3, 18))
+
+        self.assertTrue(self.scene.draw_playfield(self.screen, self.ball, circuit_grid))
+        playfield = self.scene.playfield
+        with mock.patch("pygame.draw.rect") as draw_rect:
+            self.assertFalse(
+                self.scene.draw_playfield(self.screen, self.ball, circuit_grid)
+            )
+        draw_rect.assert_not_called()
+        self.assertIs(self.scene.playfield, playfield)
+
+        background = circuit_grid.circuit_grid_background
+        self.assertEqual(
+            self.screen.get_at(background.rect.topleft),
+            background.image.get_at((0, 0)),
+        )
+
+        self.scene.invalidate_playfield()
+        self.assertTrue(self.scene.draw_playfield(self.screen, self.ball, circuit_grid))
+
     def tearDown(self):
         """
         Tear down
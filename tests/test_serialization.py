@@ -0,0 +1,138 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test saving and loading circuit grid models
+"""
+
+import io
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.model import serialization
+
+from tests.test_statevector_simulator import random_model
+
+
+class TestSerialization(unittest.TestCase):
+    """
+    Unit tests for saving and loading circuit grid models
+    """
+
+    def assert_same_model(self, model, loaded):
+        """
+        Check two models have the same nodes and derived state
+        """
+
+        self.assertEqual(loaded.max_wires, model.max_wires)
+        self.assertEqual(loaded.max_columns, model.max_columns)
+        self.assertTrue(np.array_equal(loaded.nodes, model.nodes))
+        self.assertTrue(np.array_equal(loaded.control_owners, model.control_owners))
+        self.assertTrue(np.array_equal(loaded.swap_owners, model.swap_owners))
+        self.assertEqual(loaded.get_fingerprint(), model.get_fingerprint())
+
+    def test_binary_round_trip(self):
+        """
+        Test binary records round-trip all node fields
+        """
+
+        model = random_model(6, 40, 3)
+        model.set_node(5, 39, CircuitGridNode(node_types.Z, 0.123, ctrl_a=0))
+        data = serialization.dumps(model)
+
+        self.assertEqual(len(data), serialization.HEADER.size + 6 * 40 * 15)
+        self.assert_same_model(model, serialization.loads(data))
+
+    def test_json_round_trip(self):
+        """
+        Test JSON documents round-trip all node fields
+        """
+
+        model = random_model(3, 18, 5)
+
+        self.assert_same_model(
+            model, serialization.from_json(serialization.to_json(model))
+        )
+
+    def test_json_round_trip_partial_nodes(self):
+        """
+        Test JSON documents keep swap-only and control-only cells
+        """
+
+        model = CircuitGridModel(3, 18)
+        model.set_node(0, 0, CircuitGridNode(node_types.H))
+        model.set_node(0, 1, CircuitGridNode(node_types.EMPTY, swap=2))
+        model.set_node(1, 2, CircuitGridNode(node_types.EMPTY, ctrl_a=0))
+        loaded = serialization.from_json(serialization.to_json(model))
+
+        self.assert_same_model(model, loaded)
+        self.assertEqual(loaded.get_gates(), model.get_gates())
+        self.assertEqual(len(model.get_gates()), 2)
+
+    def test_stream_many_grids(self):
+        """
+        Test streaming grids of different sizes from one file
+        """
+
+        models = [random_model(2 + seed % 4, 10 + seed, seed) for seed in range(20)]
+        file = io.BytesIO()
+        for model in models:
+            serialization.dump(model, file)
+        file.seek(0)
+
+        loaded = serialization.iter_load(file)
+        self.assertNotIsInstance(loaded, list)
+        count = 0
+        for model, loaded_model in zip(models, loaded):
+            self.assert_same_model(model, loaded_model)
+            count += 1
+        self.assertEqual(count, len(models))
+        self.assertEqual(list(loaded), [])
+
+    def test_rejects_bad_records(self):
+        """
+        Test unknown versions and truncated records are rejected
+        """
+
+        data = serialization.dumps(CircuitGridModel(3, 18))
+
+        with self.assertRaises(ValueError):
+            serialization.loads(data[:4] + b"\x63" + data[5:])
+        with self.assertRaises(ValueError):
+            serialization.loads(data[:-1])
+        with self.assertRaises(ValueError):
+            list(serialization.iter_load(io.BytesIO(data + data[:10])))
+
+    def test_load_notifies_listeners(self):
+        """
+        Test loading nodes into a model reports the changed cells
+        """
+
+        model = CircuitGridModel(3, 18)
+        changes = []
+        model.add_listener(changes.append)
+        model.load_nodes(
+            serialization.loads(serialization.dumps(random_model(3, 18, 1))).nodes
+        )
+
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(
+            {(edit[0], edit[1]) for edit in changes[0].edits},
+            set(zip(*np.nonzero(model.nodes["node_type"] != node_types.EMPTY))),
+        )
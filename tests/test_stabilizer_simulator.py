@@ -0,0 +1,95 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test stabilizer simulator
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.sim.simulation import STABILIZER_BACKEND, STATEVECTOR_BACKEND
+from qpong.sim.statevector_simulator import StatevectorSimulator
+
+from tests.test_statevector_simulator import random_model
+
+
+class TestStabilizerSimulator(unittest.TestCase):
+    """
+    Unit tests for stabilizer simulator
+    """
+
+    def test_backend_selection(self):
+        """
+        Test Clifford-only grids select the stabilizer backend
+        """
+
+        model = CircuitGridModel(3, 4)
+        model.set_node(0, 0, CircuitGridNode(node_types.H))
+        model.set_node(1, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.assertEqual(model.get_backend(), STABILIZER_BACKEND)
+
+        model.set_node(2, 2, CircuitGridNode(node_types.T))
+        self.assertEqual(model.get_backend(), STATEVECTOR_BACKEND)
+
+        model.set_node(2, 2, CircuitGridNode(node_types.X, radians=np.pi / 8))
+        self.assertEqual(model.get_backend(), STATEVECTOR_BACKEND)
+
+    def test_probabilities_match_statevector(self):
+        """
+        Test probabilities match the statevector simulator for random
+        Clifford grids
+        """
+
+        for seed in range(40):
+            model = random_model(3 + seed % 3, 18, seed, clifford_only=True)
+            expected = np.abs(StatevectorSimulator(model.max_wires).run(model.nodes))
+
+            self.assertEqual(model.get_backend(), STABILIZER_BACKEND)
+            np.testing.assert_allclose(
+                model.get_probabilities(), expected**2, atol=1e-9
+            )
+
+    def test_samples_lie_in_support(self):
+        """
+        Test sampled basis states have nonzero probability
+        """
+
+        for seed in range(10):
+            model = random_model(4, 18, seed, clifford_only=True)
+            probabilities = model.get_probabilities()
+            samples = model.measure_batch(200)
+
+            self.assertTrue(np.all(probabilities[samples] > 0))
+            self.assertGreater(probabilities[model.measure()], 0)
+
+    def test_many_qubits(self):
+        """
+        Test a GHZ state on more wires than a statevector could hold
+        """
+
+        model = CircuitGridModel(40, 40)
+        model.set_node(0, 0, CircuitGridNode(node_types.H))
+        for wire_num in range(1, 40):
+            model.set_node(wire_num, wire_num, CircuitGridNode(node_types.X, ctrl_a=0))
+
+        samples = {model.measure() for _ in range(20)}
+
+        self.assertTrue(samples <= {0, 2**40 - 1})
+        self.assertIsNone(model.simulation.column_cache.simulator)
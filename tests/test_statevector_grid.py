@@ -0,0 +1,131 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test statevector grid
+"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+import pygame
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.viz.statevector_grid import StatevectorGrid
+from qpong.utils.parameters import WINDOW_SIZE
+
+
+class TestStatevectorGrid(unittest.TestCase):
+    """
+    Unit tests for statevector grid
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        pygame.init()
+
+        flags = pygame.DOUBLEBUF | pygame.HWSURFACE
+        _ = pygame.display.set_mode(WINDOW_SIZE, flags)
+
+        self.model = CircuitGridModel(3, 18)
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.statevector_grid = StatevectorGrid(self.model, 3)
+
+    def test_prepared_measurement(self):
+        """
+        Test a prepared measurement is used once without resampling
+        """
+
+        displayed = self.statevector_grid.image
+        self.statevector_grid.prepare_measurement(
+            self.model.version, self.model.get_sampler()
+        )
+
+        self.assertIs(self.statevector_grid.image, displayed)
+        self.assertTrue(
+            self.statevector_grid.is_measurement_prepared(self.model.version)
+        )
+        prepared = self.statevector_grid.prepared_measurement[2]
+        self.assertEqual(
+            self.statevector_grid.paddle_after_measurement(self.model, 3), 1
+        )
+        self.assertIs(self.statevector_grid.image, prepared)
+        self.assertFalse(
+            self.statevector_grid.is_measurement_prepared(self.model.version)
+        )
+
+    def test_prepared_measurement_discarded_after_edit(self):
+        """
+        Test a prepared measurement is not used after the circuit changes
+        """
+
+        self.statevector_grid.prepare_measurement(
+            self.model.version, self.model.get_sampler()
+        )
+        self.model.set_node(1, 0, CircuitGridNode(node_types.X))
+
+        self.assertFalse(
+            self.statevector_grid.is_measurement_prepared(self.model.version)
+        )
+        self.assertEqual(
+            self.statevector_grid.paddle_after_measurement(self.model, 3), 3
+        )
+
+    def test_redraw_keeps_surfaces(self):
+        """
+        Test showing probabilities and measuring redraw the paddle
+        column of the same surfaces
+        """
+
+        grid = self.statevector_grid
+        images = {grid.image, grid.measurement_image}
+        labels = grid.labels.copy()
+        grid.dirty = 0
+
+        with mock.patch("pygame.Surface") as surface:
+            grid.show_probabilities(np.full(8, 1 / 8))
+            self.assertEqual(grid.dirty, 1)
+            grid.prepare_measurement(self.model.version, self.model.get_sampler())
+            grid.paddle_after_measurement(self.model, 3)
+            grid.paddle_after_measurement(self.model, 3)
+        surface.assert_not_called()
+
+        self.assertEqual({grid.image, grid.measurement_image}, images)
+        label_area = grid.rect.copy()
+        label_area.left = grid.paddle_column.right
+        label_area.width -= grid.paddle_column.width
+        self.assertTrue(
+            np.array_equal(
+                pygame.surfarray.array3d(grid.image.subsurface(label_area)),
+                pygame.surfarray.array3d(labels.subsurface(label_area)),
+            )
+        )
+        self.assertEqual(
+            grid.image.get_at((0, grid.block_size)), pygame.Color(255, 255, 255)
+        )
+        self.assertEqual(grid.image.get_at((0, 0)), pygame.Color(0, 0, 0))
+
+    def tearDown(self):
+        """
+        Tear down
+        """
+
+        pygame.quit()
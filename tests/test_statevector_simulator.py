@@ -0,0 +1,183 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test statevector simulator
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from qiskit import QuantumCircuit, QuantumRegister
+from qiskit.quantum_info import Statevector
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.sim.statevector_simulator import StatevectorSimulator
+
+GATE_TYPES = (
+    node_types.X,
+    node_types.Y,
+    node_types.Z,
+    node_types.S,
+    node_types.SDG,
+    node_types.T,
+    node_types.TDG,
+    node_types.H,
+)
+
+
+CLIFFORD_TYPES = (
+    node_types.X,
+    node_types.Y,
+    node_types.Z,
+    node_types.S,
+    node_types.SDG,
+    node_types.H,
+)
+
+
+def random_model(max_wires, max_columns, seed, clifford_only=False):
+    """
+    Build a circuit grid model with random gates
+    """
+    rng = random.Random(seed)
+    model = CircuitGridModel(max_wires, max_columns)
+    for column_num in range(max_columns):
+        wires = list(range(max_wires))
+        rng.shuffle(wires)
+        wire_num = wires.pop()
+        if rng.random() < 0.15 and wires:
+            node = CircuitGridNode(node_types.SWAP, swap=wires.pop())
+        elif clifford_only:
+            node = CircuitGridNode(rng.choice(CLIFFORD_TYPES))
+        else:
+            node = CircuitGridNode(rng.choice(GATE_TYPES))
+            if node.node_type in (node_types.X, node_types.Y, node_types.Z):
+                node.radians = rng.choice((0.0, 0.0, rng.randrange(16) * np.pi / 8))
+        if clifford_only:
+            if node.node_type in (node_types.X, node_types.Y, node_types.Z):
+                if rng.random() < 0.5:
+                    node.ctrl_a = wires.pop()
+        else:
+            if rng.random() < 0.4 and wires:
+                node.ctrl_a = wires.pop()
+            if rng.random() < 0.2 and wires:
+                node.ctrl_b = wires.pop()
+        model.set_node(wire_num, column_num, node)
+    return model
+
+
+# Qiskit method suffix of each node type, as in the original circuit grid model
+NODE_IDENTIFIERS = {
+    getattr(node_types, name.upper()): name
+    for name in ("x", "y", "z", "s", "sdg", "t", "tdg", "h")
+}
+
+
+def grid_circuit(model):
+    """
+    Build a Qiskit circuit straight from the nodes of a circuit grid, with
+    the gate resolution of the original construct_circuit, rather than
+    from the compiled instructions
+    """
+    register = QuantumRegister(model.max_wires, "q")
+    circuit = QuantumCircuit(register)
+    for column_num in range(model.max_columns):
+        for wire_num in range(model.max_wires):
+            node_type, radians, ctrl_a, ctrl_b, swap = model.nodes[
+                wire_num, column_num
+            ].tolist()
+            attr = []
+            args = []
+            if radians != 0:
+                args.append(radians)
+            for ctrl in (ctrl_a, ctrl_b):
+                if ctrl != -1:
+                    attr.append("c")
+                    args.append(register[ctrl])
+            if swap != -1:
+                attr.append("swap")
+                args += [register[wire_num], register[swap]]
+            else:
+                if radians != 0:
+                    attr.append("r")
+                if node_type != node_types.EMPTY:
+                    args.append(register[wire_num])
+                    if node_type in NODE_IDENTIFIERS:
+                        attr.append(NODE_IDENTIFIERS[node_type])
+            attr = "".join(attr)
+            if hasattr(circuit, attr):
+                getattr(circuit, attr)(*args)
+    return circuit
+
+
+class TestStatevectorSimulator(unittest.TestCase):
+    """
+    Unit tests for statevector simulator
+    """
+
+    def test_initial_state(self):
+        """
+        Test simulator starts in |0...0>
+        """
+
+        simulator = StatevectorSimulator(3)
+
+        self.assertEqual(simulator.state.shape, (8,))
+        self.assertEqual(simulator.state[0], 1)
+        self.assertAlmostEqual(np.sum(simulator.probabilities()), 1)
+
+    def test_qubit_ordering(self):
+        """
+        Test wire 0 is the least significant bit of the basis state index
+        """
+
+        model = CircuitGridModel(3, 2)
+        model.set_node(0, 0, CircuitGridNode(node_types.X))
+        model.set_node(2, 1, CircuitGridNode(node_types.X))
+
+        self.assertAlmostEqual(model.get_probabilities()[0b101], 1)
+
+    def test_matches_qiskit(self):
+        """
+        Test simulated statevectors match Qiskit's for random circuit grids
+        """
+
+        for seed in range(40):
+            model = random_model(3 + seed % 2, 18, seed)
+            expected = Statevector(grid_circuit(model)).data
+
+            np.testing.assert_allclose(model.get_statevector(), expected, atol=1e-9)
+            np.testing.assert_allclose(
+                Statevector(model.construct_circuit()).data, expected, atol=1e-9
+            )
+
+    def test_skips_gates_qiskit_skips(self):
+        """
+        Test nodes without a Qiskit gate (e.g. controlled-T) are ignored
+        """
+
+        model = CircuitGridModel(2, 2)
+        model.set_node(0, 0, CircuitGridNode(node_types.H))
+        model.set_node(1, 1, CircuitGridNode(node_types.T, ctrl_a=0))
+
+        self.assertEqual(model.get_instructions(), ((0, "h", (0,), (), 0.0),))
+        np.testing.assert_allclose(
+            model.get_statevector(), [np.sqrt(0.5), np.sqrt(0.5), 0, 0], atol=1e-9
+        )
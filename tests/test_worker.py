@@ -0,0 +1,160 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test background simulation worker
+"""
+
+import threading
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.sim.worker import SimulationWorker
+
+
+class TestSimulationWorker(unittest.TestCase):
+    """
+    Unit tests for background simulation worker
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.model = CircuitGridModel(3, 18)
+        self.worker = SimulationWorker(3, 18)
+
+    def tearDown(self):
+        """
+        Tear down
+        """
+
+        self.worker.stop()
+
+    def test_wait_returns_current_result(self):
+        """
+        Test waiting returns the probabilities of the current circuit
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.T))
+        sampler = self.worker.wait(self.model, timeout=5)
+
+        self.assertIsNotNone(sampler)
+        self.assertTrue(
+            np.allclose(sampler.probabilities(), self.model.get_probabilities())
+        )
+
+    def test_stale_result_is_discarded(self):
+        """
+        Test a result finishing after a newer submission is dropped
+        """
+
+        started = threading.Event()
+        release = threading.Event()
+        get_sampler = self.worker.simulation.get_sampler
+
+        def blocking_get_sampler(key, gates):
+            started.set()
+            release.wait(5)
+            return get_sampler(key, gates)
+
+        self.worker.simulation.get_sampler = blocking_get_sampler
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.worker.submit(self.model)
+        self.assertTrue(started.wait(5))
+        old_version = self.model.version
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.worker.submit(self.model)
+        release.set()
+        sampler = self.worker.wait(self.model, timeout=5)
+
+        self.assertEqual(self.worker.stale_results, 1)
+        self.assertIsNone(self.worker.poll(old_version))
+        self.assertEqual(sampler.sample(), 1)
+
+    def test_latest_request_wins(self):
+        """
+        Test a pending request is replaced by a newer one
+        """
+
+        self.worker.pending = (-1, None, None)
+        self.worker.submit(self.model)
+
+        self.assertEqual(self.worker.dropped_requests, 1)
+        self.assertIsNotNone(self.worker.wait(self.model, timeout=5))
+
+    def test_poll_delivers_once(self):
+        """
+        Test a result is delivered once and again after resubmission
+        """
+
+        sampler = self.worker.wait(self.model, timeout=5)
+
+        self.assertIs(self.worker.poll(self.model.version), sampler)
+        self.assertIsNone(self.worker.poll(self.model.version))
+        self.worker.submit(self.model)
+        self.assertIs(self.worker.poll(self.model.version), sampler)
+
+    def test_recovers_after_failed_simulation(self):
+        """
+        Test a failed simulation is raised on the caller's thread and
+        the worker keeps serving later requests
+        """
+
+        get_sampler = self.worker.simulation.get_sampler
+        failures = []
+
+        def failing_get_sampler(key, gates):
+            if not failures:
+                failures.append(key)
+                raise RuntimeError("simulation failed")
+            return get_sampler(key, gates)
+
+        self.worker.simulation.get_sampler = failing_get_sampler
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.worker.submit(self.model)
+
+        with self.assertRaises(RuntimeError):
+            self.worker.wait(self.model, timeout=5)
+        with self.assertRaises(RuntimeError):
+            self.worker.poll(self.model.version)
+        self.assertTrue(self.worker.thread.is_alive())
+
+        self.worker.submit(self.model)
+        sampler = self.worker.wait(self.model, timeout=5)
+        self.assertEqual(sampler.sample(), 1)
+
+    def test_start_restarts_dead_thread(self):
+        """
+        Test start replaces a worker thread that is no longer running
+        """
+
+        self.worker.start()
+        thread = self.worker.thread
+        with self.worker.condition:
+            self.worker.running = False
+            self.worker.condition.notify_all()
+        thread.join(5)
+        self.worker.running = True
+
+        self.worker.start()
+        self.assertIsNot(self.worker.thread, thread)
+        self.assertIsNotNone(self.worker.wait(self.model, timeout=5))